@@ -12,6 +12,9 @@ Core Features:
 - State persistence (状态持久化)
 """
 import asyncio
+import os
+import stat
+import uuid
 from typing import Dict, List, Optional, Any
 from pathlib import Path
 from datetime import datetime
@@ -20,6 +23,9 @@ from .mission_orchestrator import MissionOrchestrator, AtomicTask, TaskState
 from .local_reasoning import LocalReasoningEngine
 from antigravity.services.sheriff_strategist import SheriffStrategist, OptimizedPlan
 
+# O_BINARY keeps Windows from translating newlines on the raw fd
+_TEMP_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0)
+
 class AsyncPipeline:
     """
     Async pipeline for concurrent task execution / 异步流水线用于并发任务执行
@@ -123,14 +129,39 @@ class AutonomousAuditor:
         Ensures atomic file writes in concurrent execution.
         确保并发执行中的原子文件写入。
         
+        Encoding and writing happen in a temp file outside the lock; only the
+        atomic os.replace() runs under it, so readers never see a partial file.
+        编码和写入临时文件在锁外完成，锁内只做原子替换。
+        
         Args:
             file_path: Path to file / 文件路径
             content: Content to write / 要写入的内容
         """
-        async with self.file_lock_manager.lock_file(file_path):
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
-            self._log('File written safely', {'file': file_path, 'size': len(content)})
+        data = memoryview(content.encode('utf-8'))
+        # Replace the file a symlink points to, not the link itself
+        target = os.path.realpath(file_path)
+        # Same directory so the replace stays on one filesystem; unique per writer
+        temp_file = f"{target}.{os.getpid()}.{uuid.uuid4().hex}.tmp"
+        try:
+            # Raw fd: one buffer, no BufferedWriter/TextIOWrapper in between
+            fd = os.open(temp_file, _TEMP_FLAGS, 0o666)
+            try:
+                while data:
+                    data = data[os.write(fd, data):]
+            finally:
+                os.close(fd)
+            # Keep the existing file's permission bits (a new file gets the umask default)
+            try:
+                os.chmod(temp_file, stat.S_IMODE(os.stat(target).st_mode))
+            except FileNotFoundError:
+                pass
+            async with self.file_lock_manager.lock_file(file_path):
+                os.replace(temp_file, target)
+        except BaseException:
+            if os.path.exists(temp_file):
+                os.remove(temp_file)
+            raise
+        self._log('File written safely', {'file': file_path, 'size': len(content)})
 
     async def autonomous_run(self, idea: str) -> Dict:
         """
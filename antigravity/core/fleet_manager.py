@@ -17,6 +17,7 @@ from pathlib import Path
 from dataclasses import dataclass, field, asdict
 from typing import Dict, List, Optional
 import threading
+import time
 from datetime import datetime
 
 logger = logging.getLogger("antigravity.fleet")
@@ -426,26 +427,31 @@ if __name__ == "__main__":
             
         found_projects = {}
         zombies = []
+        # One clock read for the whole sweep / 整轮扫描只读取一次时钟
+        now = time.time()
         
-        for item in self.fleet_root.iterdir():
-            if item.is_dir() and not item.name.startswith('.'):
-                # Check for P3 signature
-                if (item / ".antigravity").exists():
-                    # Phase 27: Vitality Check
-                    is_alive = self._check_vitality(item)
-                    
-                    if is_alive:
-                        meta = ProjectMetadata(
-                            project_id=item.name,
-                            path=str(item),
-                            name=item.name,
-                            status='active',
-                            last_active=datetime.now().isoformat(),
-                            config=self._load_project_config(item)
-                        )
-                        found_projects[item.name] = meta
-                    else:
-                        zombies.append(item)
+        # scandir reports the entry type with the listing, so no stat per child
+        with os.scandir(self.fleet_root) as entries:
+            for entry in entries:
+                if entry.is_dir() and not entry.name.startswith('.'):
+                    item = Path(entry.path)
+                    # Check for P3 signature
+                    if (item / ".antigravity").exists():
+                        # Phase 27: Vitality Check
+                        is_alive = self._check_vitality(item, now)
+                        
+                        if is_alive:
+                            meta = ProjectMetadata(
+                                project_id=item.name,
+                                path=str(item),
+                                name=item.name,
+                                status='active',
+                                last_active=datetime.now().isoformat(),
+                                config=self._load_project_config(item)
+                            )
+                            found_projects[item.name] = meta
+                        else:
+                            zombies.append(item)
 
         # Process Zombies
         if zombies:
@@ -454,7 +460,7 @@ if __name__ == "__main__":
         self.projects = found_projects
         return found_projects
 
-    def _check_vitality(self, project_path: Path) -> bool:
+    def _check_vitality(self, project_path: Path, now: Optional[float] = None) -> bool:
         """
         Check if project is alive (Heartbeat < 1hr old).
         New projects without heartbeat are considered alive (grace period?).
@@ -462,12 +468,13 @@ if __name__ == "__main__":
         Stale Heartbeat = Zombie.
         """
         beat_file = project_path / ".antigravity" / "HEARTBEAT"
-        if not beat_file.exists():
+        try:
+            # A single stat() both checks existence and reads the mtime
+            mtime = beat_file.stat().st_mtime
+        except FileNotFoundError:
             return True # Legacy/New projects are safe
             
-        import time
-        mtime = beat_file.stat().st_mtime
-        age = time.time() - mtime
+        age = (time.time() if now is None else now) - mtime
         
         if age > 3600: # 1 Hour
             return False
@@ -20,6 +20,10 @@ from dataclasses import dataclass
 import re
 
 
+NON_WORD_PATTERN = re.compile(r'[^\w]')
+PYTHON_FILENAME_PATTERN = re.compile(r'^[a-z_][a-z0-9_]*\.py$')
+
+
 @dataclass
 class Intent:
     """
@@ -111,7 +115,7 @@ class ConstraintSet:
                         )
         
         # Check file length
-        total_lines = len(code.split('\n'))
+        total_lines = code.count('\n') + 1
         if total_lines > self.max_file_lines:
             violations.append(
                 f"File has {total_lines} lines (max: {self.max_file_lines})"
@@ -140,7 +144,7 @@ class ConstraintSet:
             for file in plan['files_to_create']:
                 if not file.endswith('.py'):
                     violations.append(f"Non-Python file: {file}")
-                if not re.match(r'^[a-z_][a-z0-9_]*\.py$', os.path.basename(file)):
+                if not PYTHON_FILENAME_PATTERN.match(os.path.basename(file)):
                     violations.append(f"Invalid Python filename: {file}")
         
         return violations
@@ -174,10 +178,10 @@ class IntentMapper:
         """
         idea_lower = idea.lower()
         
-        # Extract keywords
+        # Extract keywords (most words are already clean and skip the regex)
         keywords = []
-        for word in idea.split():
-            clean_word = re.sub(r'[^\w]', '', word.lower())
+        for word in idea_lower.split():
+            clean_word = word if word.isalnum() else NON_WORD_PATTERN.sub('', word)
             if len(clean_word) > 3:
                 keywords.append(clean_word)
         
@@ -14,9 +14,8 @@ Core Features:
 
 from enum import Enum
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional, Set
+from typing import List, Dict, Iterable, Optional, Set
 from datetime import datetime
-import networkx as nx
 import json
 from pathlib import Path
 
@@ -35,7 +34,7 @@ class TaskState(Enum):
     DONE = "done"
 
 
-@dataclass
+@dataclass(slots=True)  # Mutable: state and retry_count advance in place
 class AtomicTask:
     """Atomic task unit / 原子任务单元"""
     task_id: str
@@ -67,6 +66,90 @@ class AtomicTask:
             data['started_at'] = datetime.fromisoformat(data['started_at'])
         return cls(**data)
 
+@dataclass(frozen=True)
+class DependencyGraph:
+    """
+    Task dependency DAG in compressed sparse row form / 压缩稀疏行 (CSR) 依赖图
+    
+    Node i's successors are indices[indptr[i]:indptr[i + 1]] and its
+    predecessors rev_indices[rev_indptr[i]:rev_indptr[i + 1]]; node_ids maps
+    task ids to node numbers and node_names maps them back. Edges run dependency -> dependent, and a
+    dependency without a task of its own still becomes a node.
+    """
+    node_ids: Dict[str, int] = field(default_factory=dict)
+    indptr: List[int] = field(default_factory=lambda: [0])
+    indices: List[int] = field(default_factory=list)
+    rev_indptr: List[int] = field(default_factory=lambda: [0])
+    rev_indices: List[int] = field(default_factory=list)
+    node_names: List[str] = field(default_factory=list)
+
+    @classmethod
+    def from_tasks(cls, tasks: Iterable[AtomicTask]) -> 'DependencyGraph':
+        node_ids: Dict[str, int] = {}
+        edges = []
+        for task in tasks:
+            target = node_ids.setdefault(task.task_id, len(node_ids))
+            for dep in task.dependencies:
+                edges.append((node_ids.setdefault(dep, len(node_ids)), target))
+        edges = sorted(set(edges))
+
+        n = len(node_ids)
+        indptr, rev_indptr = [0] * (n + 1), [0] * (n + 1)
+        for src, dst in edges:
+            indptr[src + 1] += 1
+            rev_indptr[dst + 1] += 1
+        for i in range(n):
+            indptr[i + 1] += indptr[i]
+            rev_indptr[i + 1] += rev_indptr[i]
+
+        rev_indices = [0] * len(edges)
+        fill = rev_indptr[:-1]
+        for src, dst in edges:
+            rev_indices[fill[dst]] = src
+            fill[dst] += 1
+        return cls(node_ids, indptr, [dst for _, dst in edges], rev_indptr, rev_indices, list(node_ids))
+
+    def number_of_nodes(self) -> int:
+        return len(self.node_ids)
+
+    def number_of_edges(self) -> int:
+        return len(self.indices)
+
+    def successors(self, task_id: str) -> List[str]:
+        """Tasks that depend on task_id / 依赖此任务的任务"""
+        i = self.node_ids[task_id]
+        return self._names(self.indices[self.indptr[i]:self.indptr[i + 1]])
+
+    def predecessors(self, task_id: str) -> List[str]:
+        """Tasks task_id depends on / 此任务依赖的任务"""
+        i = self.node_ids[task_id]
+        return self._names(self.rev_indices[self.rev_indptr[i]:self.rev_indptr[i + 1]])
+
+    def topological_order(self) -> List[str]:
+        """
+        Dependencies before dependents (Kahn's algorithm) / 拓扑排序
+        
+        Raises:
+            ValueError: If the dependencies contain a cycle
+        """
+        in_degree = [self.rev_indptr[i + 1] - self.rev_indptr[i] for i in range(len(self.node_ids))]
+        ready = [i for i, degree in enumerate(in_degree) if degree == 0]
+        order = []
+        while ready:
+            i = ready.pop()
+            order.append(i)
+            for j in self.indices[self.indptr[i]:self.indptr[i + 1]]:
+                in_degree[j] -= 1
+                if in_degree[j] == 0:
+                    ready.append(j)
+        if len(order) != len(self.node_ids):
+            raise ValueError("Task dependencies contain a cycle")
+        return self._names(order)
+
+    def _names(self, nodes: Iterable[int]) -> List[str]:
+        names = self.node_names
+        return [names[i] for i in nodes]
+
 class ContextDriftError(Exception):
     """Raised when physical file state diverges from memory state"""
     pass
@@ -78,7 +161,6 @@ class MissionOrchestrator:
     """
     def __init__(self, project_root: str = None):
         from pathlib import Path
-        import networkx as nx
         
         # 审查官补丁：通过文件祖先链自动定位根目录
         if project_root is None:
@@ -98,14 +180,10 @@ class MissionOrchestrator:
         self.tasks: List[AtomicTask] = []
         self.execution_history: List[Dict] = []
         self.current_task: Optional[AtomicTask] = None
-        self.graph = nx.DiGraph()
+        self.graph = DependencyGraph()
         
     def build_dependency_graph(self):
-        self.graph = nx.DiGraph()
-        for task in self.tasks:
-            self.graph.add_node(task.task_id, data=task)
-            for dep in task.dependencies:
-                self.graph.add_edge(dep, task.task_id)
+        self.graph = DependencyGraph.from_tasks(self.tasks)
 
     def _attempt_healing(self) -> bool:
         """Internal self-healing stub"""
@@ -11,6 +11,7 @@ Features:
 - Limit history to last 10 audits per project
 - Checksum validation for data integrity
 - Lazy loading for performance
+- Binary (msgpack) history files when msgpack is installed
 
 Phase 21 P2 Enhancements:
 - Audit sharding with checksum
@@ -21,11 +22,17 @@ Phase 21 P2 Enhancements:
 from __future__ import annotations
 import json
 import hashlib
+import os
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Optional, TYPE_CHECKING
+from typing import Iterable, List, Dict, Optional, Tuple, TYPE_CHECKING
 from dataclasses import asdict
 
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
 if TYPE_CHECKING:
     from .delivery_gate import DeliveryResult
 
@@ -40,6 +47,9 @@ class AuditHistoryManager:
     HISTORY_DIR = ".antigravity_audits"
     MAX_HISTORY = 10
     MAX_DIR_SIZE_MB = 10  # 审查官约束：不超过 10MB
+    # History file suffixes: msgpack when available, JSON otherwise (and for legacy files)
+    # 历史文件后缀：可用时使用 msgpack，否则（以及旧文件）使用 JSON
+    HISTORY_SUFFIXES = ('.mpk', '.json')
     
     def __init__(self, project_root: Path):
         """
@@ -51,6 +61,9 @@ class AuditHistoryManager:
         self.project_root = project_root
         self.history_dir = project_root / self.HISTORY_DIR
         self.history_dir.mkdir(exist_ok=True)
+        # Validated history per project, keyed by file (path, mtime_ns, size)
+        # 每个项目已校验的历史，以文件 (路径, mtime_ns, 大小) 为键
+        self._history_cache: Dict[str, Tuple[Tuple[str, int, int], List[Dict]]] = {}
     
     def save_audit(self, result: DeliveryResult, project_name: str):
         """
@@ -60,12 +73,50 @@ class AuditHistoryManager:
             result: Delivery gate result / 交付门控结果
             project_name: Project name / 项目名称
         """
-        history_file = self.history_dir / f"{project_name}_history.json"
+        self.save_audits([result], project_name)
+    
+    def save_audits(self, results: Iterable[DeliveryResult], project_name: str):
+        """
+        Save several audit results in one write / 一次写入保存多个审计结果
+        
+        Equivalent to calling save_audit for each result in order, but the
+        history is loaded, written and size-checked only once.
+        等价于按顺序逐个调用 save_audit，但历史只加载、写入和检查大小一次。
+        
+        Args:
+            results: Delivery gate results, oldest first / 交付门控结果（按时间先后）
+            project_name: Project name / 项目名称
+        """
+        new_records = [self._make_record(result) for result in results]
+        if not new_records:
+            return
         
         # Load existing history
         history = self._load_history(project_name)
         
-        # Create audit record
+        # Newest first, limited to MAX_HISTORY (the cached list is never mutated)
+        new_records.reverse()
+        history = (new_records + history)[:self.MAX_HISTORY]
+        
+        history_file = self._write_history(project_name, history)
+        
+        # Every record is either freshly checksummed or already validated,
+        # so seed the cache instead of re-reading the file on the next call
+        self._history_cache[project_name] = (self._file_key(history_file), history)
+        
+        # Check directory size and cleanup if needed
+        self._enforce_size_limit()
+    
+    def _make_record(self, result: DeliveryResult) -> Dict:
+        """
+        Build a checksummed audit record / 构建带校验和的审计记录
+        
+        Args:
+            result: Delivery gate result / 交付门控结果
+            
+        Returns:
+            Audit record / 审计记录
+        """
         audit_record = {
             'timestamp': datetime.now().isoformat(),
             'can_deliver': result.can_deliver,
@@ -81,19 +132,7 @@ class AuditHistoryManager:
         
         # Add checksum for data integrity (Phase 21 P2)
         audit_record['checksum'] = self._calculate_checksum(audit_record)
-        
-        # Add to front
-        history.insert(0, audit_record)
-        
-        # Limit to MAX_HISTORY
-        history = history[:self.MAX_HISTORY]
-        
-        # Save with pretty formatting
-        with open(history_file, 'w', encoding='utf-8') as f:
-            json.dump(history, f, indent=2, ensure_ascii=False)
-        
-        # Check directory size and cleanup if needed
-        self._enforce_size_limit()
+        return audit_record
     
     def get_history(self, project_name: str, limit: int = 3) -> List[Dict]:
         """
@@ -159,20 +198,29 @@ class AuditHistoryManager:
         """
         Load history from file / 从文件加载历史
         
+        The returned list is shared with the cache; callers must not mutate it.
+        返回的列表与缓存共享，调用方不得修改。
+        
         Args:
             project_name: Project name / 项目名称
             
         Returns:
             List of audit records / 审计记录列表
         """
-        history_file = self.history_dir / f"{project_name}_history.json"
+        history_file = self._find_history_file(project_name)
         
-        if not history_file.exists():
+        if history_file is None:
+            self._history_cache.pop(project_name, None)
             return []
         
+        # Reuse the decoded and validated records while the file is unchanged
+        key = self._file_key(history_file)
+        cached = self._history_cache.get(project_name)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        
         try:
-            with open(history_file, 'r', encoding='utf-8') as f:
-                history = json.load(f)
+            history = self._decode(history_file.read_bytes())
             
             # Validate checksums (Phase 21 P2)
             validated_history = []
@@ -182,12 +230,101 @@ class AuditHistoryManager:
                 else:
                     print(f"⚠️ Checksum validation failed for record: {record.get('timestamp')}")
             
+            self._history_cache[project_name] = (key, validated_history)
             return validated_history
         
         except Exception as e:
             print(f"❌ Failed to load audit history: {e}")
             return []
     
+    def _history_path(self, project_name: str, suffix: str) -> Path:
+        """History file path for a suffix / 指定后缀的历史文件路径"""
+        return self.history_dir / f"{project_name}_history{suffix}"
+    
+    def _find_history_file(self, project_name: str) -> Optional[Path]:
+        """
+        Locate the most recently written history file / 查找最近写入的历史文件
+        
+        Both files exist when history was last written without msgpack after
+        an earlier binary write; the newer one wins, binary on a tie.
+        两种文件并存时（无 msgpack 环境写入过 JSON）取较新者，同时则取二进制。
+        
+        Returns:
+            Existing history file or None / 已存在的历史文件或 None
+        """
+        # Binary files are unreadable without msgpack, so only look for JSON then
+        suffixes = self.HISTORY_SUFFIXES if msgpack is not None else ('.json',)
+        newest, newest_mtime = None, None
+        for suffix in suffixes:
+            path = self._history_path(project_name, suffix)
+            try:
+                mtime = path.stat().st_mtime_ns
+            except FileNotFoundError:
+                continue
+            if newest is None or mtime > newest_mtime:
+                newest, newest_mtime = path, mtime
+        return newest
+    
+    @staticmethod
+    def _file_key(path: Path) -> Tuple[str, int, int]:
+        """Cache key for a history file / 历史文件缓存键"""
+        st = path.stat()
+        return (path.suffix, st.st_mtime_ns, st.st_size)
+    
+    def _write_history(self, project_name: str, history: List[Dict]) -> Path:
+        """
+        Write history in the preferred format / 以首选格式写入历史
+        
+        With msgpack the record list is written as one packed blob and any
+        legacy JSON file is removed; without it, compact JSON is written.
+        有 msgpack 时写入二进制并删除旧 JSON 文件；否则写入紧凑 JSON。
+        """
+        if msgpack is not None:
+            path = self._history_path(project_name, '.mpk')
+            path.write_bytes(msgpack.packb(history, use_bin_type=True))
+            legacy = self._history_path(project_name, '.json')
+            if legacy.exists():
+                legacy.unlink()
+        else:
+            path = self._history_path(project_name, '.json')
+            path.write_text(
+                json.dumps(history, ensure_ascii=False, separators=(',', ':')),
+                encoding='utf-8'
+            )
+        return path
+    
+    @staticmethod
+    def _decode(data: bytes) -> List[Dict]:
+        """
+        Decode history bytes, sniffing legacy JSON / 解码历史数据（自动识别旧 JSON）
+        
+        A JSON history always starts with '[' (after optional whitespace);
+        a msgpack array never does.
+        JSON 历史总是以 '[' 开头；msgpack 数组不会。
+        """
+        head = data.lstrip()[:1]
+        if not head:
+            return []
+        if head == b'[':
+            return json.loads(data)
+        return msgpack.unpackb(data, raw=False)
+    
+    def _history_files(self) -> List[os.DirEntry]:
+        """
+        All history files in the directory / 目录中的所有历史文件
+        
+        One scandir pass; each DirEntry caches its stat() result, so sizes
+        and mtimes are fetched at most once per file per call.
+        单次 scandir 遍历；DirEntry 缓存 stat() 结果，每个文件最多查询一次。
+        """
+        with os.scandir(self.history_dir) as it:
+            return [
+                entry for entry in it
+                if entry.name.endswith(self.HISTORY_SUFFIXES)
+                and '_history.' in entry.name
+                and entry.is_file()
+            ]
+    
     def _calculate_checksum(self, record: Dict) -> str:
         """
         Calculate checksum for audit record / 计算审计记录校验和
@@ -231,7 +368,8 @@ class AuditHistoryManager:
         
         Phase 21 P2: 审查官约束 - 不超过 10MB
         """
-        total_size = sum(f.stat().st_size for f in self.history_dir.glob('*.json'))
+        history_files = self._history_files()
+        total_size = sum(f.stat().st_size for f in history_files)
         total_size_mb = total_size / (1024 * 1024)
         
         if total_size_mb > self.MAX_DIR_SIZE_MB:
@@ -240,10 +378,7 @@ class AuditHistoryManager:
             print(f"   Cleaning up oldest records...")
             
             # Get all history files sorted by modification time
-            history_files = sorted(
-                self.history_dir.glob('*.json'),
-                key=lambda f: f.stat().st_mtime
-            )
+            history_files.sort(key=lambda f: f.stat().st_mtime)
             
             # Remove oldest files until under limit
             for file in history_files:
@@ -251,7 +386,7 @@ class AuditHistoryManager:
                     break
                 
                 file_size_mb = file.stat().st_size / (1024 * 1024)
-                file.unlink()
+                os.unlink(file.path)
                 total_size_mb -= file_size_mb
                 print(f"   Removed: {file.name} ({file_size_mb:.2f}MB)")
     
@@ -262,7 +397,7 @@ class AuditHistoryManager:
         Returns:
             Directory statistics / 目录统计
         """
-        files = list(self.history_dir.glob('*.json'))
+        files = self._history_files()
         total_size = sum(f.stat().st_size for f in files)
         
         return {
@@ -18,15 +18,92 @@ Only projects with BOTH signatures can be delivered!
 只有获得双重签名的项目才能交付！
 """
 import ast
+import hashlib
 import json
+import mmap
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from pathlib import Path
 from datetime import datetime
 import logging
 logger = logging.getLogger(__name__)
 
+SECRET_KEYWORDS = ('secret', 'api_key', 'token', 'password')
+MMAP_HASH_THRESHOLD = 1 << 20  # Files at least this large are hashed through mmap
+_READ_FLAGS = os.O_RDONLY | getattr(os, 'O_BINARY', 0)
+UNSAFE_CALLS = ('eval', 'exec')
+
+@dataclass
+class FileAuditResult:
+    """单文件静态扫描结果 - Compact per-file result of the static scan"""
+    syntax_error: Optional[str] = None
+    missing_docstrings: int = 0
+    security_issues: List[str] = field(default_factory=list)
+
+def _scan_file(path_str: str) -> FileAuditResult:
+    """
+    Parse one file and collect everything Tier 1 needs from it / 解析单个文件并收集一级审计所需信息
+    
+    Module-level and side-effect free so it can run in a worker process;
+    returns a small dataclass instead of the AST to keep IPC cheap.
+    """
+    # Raw bytes: ast.parse decodes them itself, honouring BOMs and coding cookies
+    with open(path_str, 'rb') as f:
+        source = f.read()
+    if not source:
+        return FileAuditResult()
+    try:
+        tree = ast.parse(source)
+    except SyntaxError as e:
+        return FileAuditResult(syntax_error=str(e))
+    name = os.path.basename(path_str)
+    result = FileAuditResult()
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.FunctionDef, ast.ClassDef)):
+            if not ast.get_docstring(node):
+                result.missing_docstrings += 1
+        if isinstance(node, ast.Assign):
+            for target in node.targets:
+                if isinstance(target, ast.Name):
+                    var_name = target.id.lower()
+                    if any((keyword in var_name for keyword in SECRET_KEYWORDS)):
+                        if isinstance(node.value, ast.Constant) and len(str(node.value.value)) > 10:
+                            result.security_issues.append(f'Potential hardcoded secret in {name}: {target.id}')
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name):
+            if node.func.id in UNSAFE_CALLS:
+                result.security_issues.append(f'Unsafe function call in {name}: {node.func.id}()')
+    return result
+
+def _hash_file(path_str: str) -> Tuple[str, str]:
+    """
+    SHA-256 of one file plus its hash-cache key / 单文件 SHA-256 及其缓存键
+    
+    Module-level so it can run in a worker process; takes and returns
+    plain strings so nothing but paths and hex digests crosses IPC.
+    Reads through a raw fd (no buffered file object per file) and maps
+    large files instead of copying them into Python.
+    """
+    hasher = hashlib.sha256()
+    fd = os.open(path_str, _READ_FLAGS)
+    try:
+        stat = os.fstat(fd)
+        if stat.st_size >= MMAP_HASH_THRESHOLD:
+            with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mapped:
+                hasher.update(mapped)
+        else:
+            # Source files usually fit in one read; loop in case the file grew
+            chunk = os.read(fd, stat.st_size + 1)
+            while chunk:
+                hasher.update(chunk)
+                chunk = os.read(fd, 65536)
+    finally:
+        os.close(fd)
+    digest = hasher.hexdigest()
+    return digest, f"{path_str}|{stat.st_mtime_ns}|{stat.st_size}"
+
 @dataclass
 class LocalSignature:
     """本地签名 - Local Signature"""
@@ -91,6 +168,8 @@ class DeliveryGate:
     MIN_CORE_COVERAGE = 90.0
     REQUIRE_HAPPY_PATH_TESTS = True
     MIN_LOGIC_SCORE = 90.0
+    PARALLEL_SCAN_THRESHOLD = 100  # Uncached files before the scan moves to a process pool
+    PARALLEL_HASH_THRESHOLD = 1000  # Unhashed files before Merkle hashing moves to a process pool
 
     def __init__(self, project_root):
         """
@@ -104,7 +183,12 @@ class DeliveryGate:
         from antigravity.services.sheriff_strategist import SheriffStrategist
         self.local_reasoner = LocalReasoningEngine(project_root)
         self.remote_strategist = SheriffStrategist()
-        self._ast_cache: Dict[str, tuple[ast.AST, float]] = {}
+        # path -> ((st_mtime_ns, st_size), result); survives across audits on this gate
+        self._scan_cache: Dict[str, Tuple[Tuple[int, int], FileAuditResult]] = {}
+        # Merkle leaf hashes by "path|mtime_ns|size", mirrored to .antigravity_hash_cache.json
+        self._merkle_cache: Optional[Dict[str, str]] = None
+        # path -> leaf hash for the tree the last root was computed from
+        self._merkle_leaves: Optional[Dict[str, str]] = None
 
     async def can_deliver(self, project: Dict) -> DeliveryResult:
         """
@@ -181,16 +265,17 @@ class DeliveryGate:
         - Security baseline (安全基线)
         """
         issues = []
-        syntax_errors = self._check_syntax_errors(project)
+        scans = self._scan_project()
+        syntax_errors = self._check_syntax_errors(project, scans)
         if syntax_errors > self.MAX_SYNTAX_ERRORS:
             issues.append(f'Syntax errors: {syntax_errors} (max: {self.MAX_SYNTAX_ERRORS})')
         import_errors = self._check_import_errors(project)
         if import_errors > self.MAX_IMPORT_ERRORS:
             issues.append(f'Import errors: {import_errors} (max: {self.MAX_IMPORT_ERRORS})')
-        vibe_score = self._calculate_vibe_score(project)
+        vibe_score = self._calculate_vibe_score(project, scans)
         if vibe_score < self.MIN_VIBE_SCORE:
             issues.append(f'Vibe score: {vibe_score:.1f} (min: {self.MIN_VIBE_SCORE})')
-        security_issues = self._check_security_baseline(project)
+        security_issues = self._check_security_baseline(project, scans)
         if len(security_issues) > self.MAX_SECURITY_ISSUES:
             issues.extend([f'Security: {issue}' for issue in security_issues])
         return {'passed': len(issues) == 0, 'issues': issues, 'metrics': {'syntax_errors': syntax_errors, 'import_errors': import_errors, 'vibe_score': vibe_score, 'security_issues': len(security_issues)}}
@@ -240,73 +325,46 @@ class DeliveryGate:
             issues.extend([f'Race condition: {rc}' for rc in race_conditions])
         return {'passed': len(issues) == 0, 'issues': issues, 'metrics': {'logic_score': logic_score, 'naming_issues_count': len(naming_issues), 'race_conditions_count': len(race_conditions)}}
 
-    def _check_syntax_errors(self, project: Dict) -> int:
+    def _check_syntax_errors(self, project: Dict, scans: Optional[List[Tuple[Path, FileAuditResult]]] = None) -> int:
         """Check for syntax errors / 检查语法错误"""
         error_count = 0
-        project_files = list(self.project_root.glob('**/*.py'))
-        for file_path in project_files:
-            if 'test_' in file_path.name or '__pycache__' in str(file_path):
+        for file_path, scan in (scans if scans is not None else self._scan_project()):
+            if 'test_' in file_path.name:
                 continue
-            try:
-                tree = self._get_cached_ast(file_path)
-            except SyntaxError as e:
+            if scan.syntax_error is not None:
                 error_count += 1
-                logger.warning(f'Syntax error in {file_path}: {e}')
+                logger.warning(f'Syntax error in {file_path}: {scan.syntax_error}')
         return error_count
 
     def _check_import_errors(self, project: Dict) -> int:
         """Check for import errors / 检查导入错误"""
         return 0
 
-    def _calculate_vibe_score(self, project: Dict) -> float:
+    def _calculate_vibe_score(self, project: Dict, scans: Optional[List[Tuple[Path, FileAuditResult]]] = None) -> float:
         """
         Calculate Vibe Score using AST analysis / 使用 AST 分析计算 Vibe Score
         
-        Phase 21 P0: Uses cached AST to avoid repeated parsing.
+        Phase 21 P0: Uses cached scan results to avoid repeated parsing.
         """
         score = 100.0
-        project_files = list(self.project_root.glob('**/*.py'))
-        for file_path in project_files:
+        for file_path, scan in (scans if scans is not None else self._scan_project()):
             if 'test_' in file_path.name or file_path.name == '__init__.py':
                 continue
-            if '__pycache__' in str(file_path):
-                continue
-            try:
-                tree = self._get_cached_ast(file_path)
-                for node in ast.walk(tree):
-                    if isinstance(node, (ast.FunctionDef, ast.ClassDef)):
-                        if not ast.get_docstring(node):
-                            score -= 2
-            except SyntaxError:
+            if scan.syntax_error is not None:
                 score -= 20
+            else:
+                score -= 2 * scan.missing_docstrings
         return max(0, min(100, score))
 
-    def _check_security_baseline(self, project: Dict) -> List[str]:
+    def _check_security_baseline(self, project: Dict, scans: Optional[List[Tuple[Path, FileAuditResult]]] = None) -> List[str]:
         """
         Tier 1 Enhancement: Security Baseline Check / 安全基线检查
         
         Phase 21 P0: Detect hardcoded secrets and unsafe function calls.
         """
         issues = []
-        project_files = list(self.project_root.glob('**/*.py'))
-        for file_path in project_files:
-            if '__pycache__' in str(file_path):
-                continue
-            try:
-                tree = self._get_cached_ast(file_path)
-                for node in ast.walk(tree):
-                    if isinstance(node, ast.Assign):
-                        for target in node.targets:
-                            if isinstance(target, ast.Name):
-                                var_name = target.id.lower()
-                                if any((keyword in var_name for keyword in ['secret', 'api_key', 'token', 'password'])):
-                                    if isinstance(node.value, ast.Constant) and len(str(node.value.value)) > 10:
-                                        issues.append(f'Potential hardcoded secret in {file_path.name}: {target.id}')
-                    if isinstance(node, ast.Call) and isinstance(node.func, ast.Name):
-                        if node.func.id in ['eval', 'exec']:
-                            issues.append(f'Unsafe function call in {file_path.name}: {node.func.id}()')
-            except SyntaxError:
-                pass
+        for file_path, scan in (scans if scans is not None else self._scan_project()):
+            issues.extend(scan.security_issues)
         return issues
 
     async def _read_coverage_json(self, project: Dict) -> Dict:
@@ -346,23 +404,36 @@ class DeliveryGate:
         """
         return []
 
-    def _get_cached_ast(self, file_path: Path) -> ast.AST:
+    def _scan_project(self) -> List[Tuple[Path, FileAuditResult]]:
         """
-        Get cached AST or parse and cache / 获取缓存的 AST 或解析并缓存
+        Scan every source file once for all Tier 1 checks / 一次扫描供所有一级检查使用
         
-        Phase 21 P0: AST caching for performance optimization.
+        Results are cached by (st_mtime_ns, st_size), so only new or modified
+        files are parsed. Large batches go to a process pool: parsing is
+        CPU-bound and a thread pool would serialize on the GIL.
         """
-        file_path_str = str(file_path)
-        mtime = file_path.stat().st_mtime
-        if file_path_str in self._ast_cache:
-            cached_tree, cached_mtime = self._ast_cache[file_path_str]
-            if cached_mtime == mtime:
-                return cached_tree
-        with open(file_path, 'r', encoding='utf-8') as f:
-            code = f.read()
-        tree = ast.parse(code)
-        self._ast_cache[file_path_str] = (tree, mtime)
-        return tree
+        files = sorted(f for f in self.project_root.glob('**/*.py') if '__pycache__' not in str(f))
+        stamps = {}
+        stale = []
+        for file_path in files:
+            path_str = str(file_path)
+            st = file_path.stat()
+            stamps[path_str] = (st.st_mtime_ns, st.st_size)
+            cached = self._scan_cache.get(path_str)
+            if cached is None or cached[0] != stamps[path_str]:
+                stale.append(path_str)
+        
+        if len(stale) < self.PARALLEL_SCAN_THRESHOLD:
+            results = map(_scan_file, stale)
+            for path_str, result in zip(stale, results):
+                self._scan_cache[path_str] = (stamps[path_str], result)
+        else:
+            max_workers = max(1, int((os.cpu_count() or 1) * 0.6))
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                for path_str, result in zip(stale, executor.map(_scan_file, stale, chunksize=16)):
+                    self._scan_cache[path_str] = (stamps[path_str], result)
+        
+        return [(file_path, self._scan_cache[str(file_path)][1]) for file_path in files]
 
     def _generate_local_signature(self, audit_results: Dict) -> LocalSignature:
         """Generate local signature / 生成本地签名"""
@@ -444,7 +515,7 @@ class DeliveryGate:
                     
         return hasher.hexdigest()
 
-    def _calculate_merkle_root(self, force_refresh: bool = False) -> str:
+    def _calculate_merkle_root(self, force_refresh: bool = False, max_workers: Optional[int] = None) -> str:
         """
         Calculate Merkle root of source code tree
         
@@ -453,103 +524,125 @@ class DeliveryGate:
         
         Args:
             force_refresh: If True, ignore cache and recompute all hashes.
+            max_workers: Hashing processes for large batches (default: 60% of CPUs).
         
         Returns:
             Merkle root hash
         """
-        import hashlib
-        import os
-        import json
-        import concurrent.futures
-        from pathlib import Path
-        
-        # Load Cache (if not forced refresh)
+        # Load Cache (if not forced refresh); kept in memory after the first load
         cache_file = self.project_root / '.antigravity_hash_cache.json'
-        hash_cache = {}
-        if not force_refresh and cache_file.exists():
+        if force_refresh:
+            hash_cache = {}
+        elif self._merkle_cache is not None:
+            hash_cache = self._merkle_cache
+        else:
+            hash_cache = {}
+            if cache_file.exists():
+                try:
+                    with open(cache_file, 'r', encoding='utf-8') as f:
+                        hash_cache = json.load(f)
+                except Exception:
+                    pass # Corrupt cache, recompute
+
+        # One scandir pass lists files and their stat results together
+        # (os.walk scans the same entries but throws the stat data away).
+        # Walk from the absolute root so leaf keys match update_leaf's
+        entries = []
+        pending = [os.path.abspath(self.project_root)]
+        while pending:
             try:
-                with open(cache_file, 'r', encoding='utf-8') as f:
-                    hash_cache = json.load(f)
-            except Exception:
-                pass # Corrupt cache, recompute
-
-        # Optimize scanning: os.walk is faster than pathlib.glob
-        valid_files = []
-        root_str = str(self.project_root)
-        for root, dirs, files in os.walk(root_str):
-            if '__pycache__' in root:
+                with os.scandir(pending.pop()) as it:
+                    for entry in it:
+                        try:
+                            if entry.is_dir():
+                                # Like os.walk: no symlinked dirs, no __pycache__
+                                if entry.name != '__pycache__' and not entry.is_symlink():
+                                    pending.append(entry.path)
+                            elif entry.name.endswith('.py'):
+                                entries.append((entry.path, entry.stat()))
+                        except OSError:
+                            continue # File might have vanished
+            except OSError:
                 continue
-            dirs[:] = [d for d in dirs if d != '__pycache__']
-            
-            for file in files:
-                if file.endswith('.py'):
-                    valid_files.append(os.path.join(root, file))
         
-        valid_files.sort()
-        file_count = len(valid_files)
+        entries.sort()
+        valid_files = [f_path_str for f_path_str, _ in entries]
         
         # Identify files needing re-hash
         files_to_hash = []
         file_hashes_map = {} # path -> hash
+        current_cache = {}
         
-        for f_path_str in valid_files:
-            try:
-                stat = os.stat(f_path_str)
-                # Key: path + mtime + size
-                cache_key = f"{f_path_str}|{stat.st_mtime}|{stat.st_size}"
-                if cache_key in hash_cache:
-                    file_hashes_map[f_path_str] = hash_cache[cache_key]
-                else:
-                    files_to_hash.append(f_path_str)
-            except OSError:
-                continue # File might have vanished
+        for f_path_str, stat in entries:
+            # Key: path + mtime (ns) + size
+            cache_key = f"{f_path_str}|{stat.st_mtime_ns}|{stat.st_size}"
+            if cache_key in hash_cache:
+                file_hashes_map[f_path_str] = current_cache[cache_key] = hash_cache[cache_key]
+            else:
+                files_to_hash.append(f_path_str)
 
         # Hash new/modified files
         if files_to_hash:
-            if len(files_to_hash) < 100: # Lower threshold for incremental updates
-                # Single-threaded
-                for f_path in files_to_hash:
-                    with open(f_path, 'rb') as f:
-                        h = hashlib.sha256(f.read()).hexdigest()
-                        file_hashes_map[f_path] = h
-                        # Update cache (using stat from loop above would differ slightly, assume mostly atomic)
-                        stat = os.stat(f_path)
-                        cache_key = f"{f_path}|{stat.st_mtime}|{stat.st_size}"
-                        hash_cache[cache_key] = h
-            else:
-                # Multi-threaded
+            if max_workers is None:
                 max_workers = max(1, int((os.cpu_count() or 1) * 0.6))
-                
-                def _hash_and_return(f_path_str):
-                    with open(f_path_str, 'rb') as f:
-                        h = hashlib.sha256(f.read()).hexdigest()
-                    stat = os.stat(f_path_str)
-                    k = f"{f_path_str}|{stat.st_mtime}|{stat.st_size}"
-                    return f_path_str, h, k
-                
-                with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-                    for f_path, h, k in executor.map(_hash_and_return, files_to_hash):
-                        file_hashes_map[f_path] = h
-                        hash_cache[k] = h
+            if len(files_to_hash) < self.PARALLEL_HASH_THRESHOLD or max_workers < 2:
+                # Small files hash faster than a pool can start (and sha256 holds
+                # the GIL below 2 KiB, so threads would only add overhead)
+                hashed = list(map(_hash_file, files_to_hash))
+            else:
+                with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                    hashed = list(executor.map(_hash_file, files_to_hash, chunksize=64))
+            for f_path, (h, k) in zip(files_to_hash, hashed):
+                file_hashes_map[f_path] = h
+                current_cache[k] = h
         
-        # Save cache
-        try:
-            with open(cache_file, 'w', encoding='utf-8') as f:
-                json.dump(hash_cache, f, indent=0)
-        except Exception:
-            pass
+        # Save cache: only entries for current files, and only when something changed
+        self._merkle_cache = current_cache
+        if files_to_hash or len(current_cache) != len(hash_cache) or not cache_file.exists():
+            try:
+                with open(cache_file, 'w', encoding='utf-8') as f:
+                    json.dump(current_cache, f, indent=0)
+            except Exception:
+                pass
 
         # Collect hashes in sorted order
-        final_hashes = []
-        for f_path in valid_files:
-            if f_path in file_hashes_map:
-                final_hashes.append(file_hashes_map[f_path])
-                
-        if not final_hashes:
+        self._merkle_leaves = {f_path: file_hashes_map[f_path] for f_path in valid_files}
+        return self._combine_leaves()
+
+    def update_leaf(self, path) -> str:
+        """
+        Re-hash one changed file and return the new Merkle root / 增量更新单个叶子
+        
+        Reads only that file instead of stat-ing the whole tree; a deleted
+        file drops out of the tree. Falls back to _calculate_merkle_root
+        until a full root has been computed once.
+        
+        Args:
+            path: Changed .py file, absolute or relative to the project root
+        
+        Returns:
+            Merkle root hash
+        """
+        if self._merkle_leaves is None:
+            return self._calculate_merkle_root()
+        # Same spelling as the walk's keys: absolute, normalized, symlinks kept
+        path_str = os.path.abspath(os.path.join(os.path.abspath(self.project_root), path))
+        try:
+            digest, cache_key = _hash_file(path_str)
+        except FileNotFoundError:
+            self._merkle_leaves.pop(path_str, None)
+        else:
+            self._merkle_leaves[path_str] = digest
+            if self._merkle_cache is not None:
+                self._merkle_cache[cache_key] = digest
+        return self._combine_leaves()
+
+    def _combine_leaves(self) -> str:
+        """Root over the current leaves in path order / 按路径顺序合并叶子哈希"""
+        if not self._merkle_leaves:
             return hashlib.sha256(b'empty').hexdigest()
-        combined = ''.join(final_hashes)
-        merkle_root = hashlib.sha256(combined.encode()).hexdigest()
-        return merkle_root
+        combined = ''.join(self._merkle_leaves[f_path] for f_path in sorted(self._merkle_leaves))
+        return hashlib.sha256(combined.encode()).hexdigest()
 
     def verify_integrity(self) -> bool:
         """
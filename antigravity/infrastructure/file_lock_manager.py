@@ -9,6 +9,7 @@ Core Features:
 - File-level locking (文件级锁定)
 - Async context manager (异步上下文管理器)
 - LRU cache for lock lifecycle (LRU 缓存管理锁生命周期)
+- Refcounted keys with a pool of idle locks (引用计数 + 空闲锁池)
 - Timeout mechanism (超时机制)
 - Lock statistics (锁统计)
 
@@ -17,6 +18,8 @@ Think of it as a "traffic cop" for file access!
 """
 
 import asyncio
+import functools
+import os
 from typing import Dict, Optional
 from pathlib import Path
 from contextlib import asynccontextmanager
@@ -27,6 +30,40 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=2048)
+def _resolve(abs_path: str) -> str:
+    """
+    Memoized Path.resolve() / 缓存的路径解析
+    
+    resolve() stats every path component, and the same few files are locked
+    over and over. Keyed by absolute path so a chdir cannot return a stale
+    hit; call FileLockManager.clear_path_cache() after renames or symlink
+    changes.
+    """
+    return str(Path(abs_path).resolve())
+
+
+# Feature test for the one private detail _FastLock relies on: the queue of
+# waiting acquirers. If a future asyncio drops it, every acquire takes the
+# plain awaited path instead of guessing.
+_LOCK_HAS_WAITERS = '_waiters' in vars(asyncio.Lock())
+
+
+class _FastLock(asyncio.Lock):
+    """
+    asyncio.Lock that knows when acquire() cannot block / 可判断能否立即获取的 asyncio.Lock
+    
+    Lets lock_file() await acquire() directly on a free lock, skipping the
+    Task that asyncio.wait_for() wraps around it when a timeout is given.
+    """
+    
+    def _can_acquire_now(self) -> bool:
+        """Free with nobody queued, so acquire() returns at once (keeps FIFO fairness) / 空闲且无人排队"""
+        if self.locked() or not _LOCK_HAS_WAITERS:
+            return False
+        return not self._waiters
+
+
 class FileLockManager:
     """
     File Lock Manager - 文件锁管理器
@@ -51,40 +88,81 @@ class FileLockManager:
         Args:
             max_locks: Maximum number of locks to cache / 最大缓存锁数量
         """
-        self._locks: OrderedDict[str, asyncio.Lock] = OrderedDict()
+        self._locks: OrderedDict[str, _FastLock] = OrderedDict()
+        self._refcounts: Dict[str, int] = {}  # Tasks holding or waiting on each lock
+        self._pool: list[_FastLock] = []  # Idle locks returned by eviction, reused for new keys
         self._lock_stats: Dict[str, int] = {}  # Track lock acquisitions
-        self._global_lock = asyncio.Lock()  # For thread-safe lock creation
         self._timeout_events: list[Dict] = []  # Track timeout events
         self.max_locks = max_locks
     
-    async def _get_or_create_lock(self, normalized_path: str) -> asyncio.Lock:
+    def _get_or_create_lock(self, normalized_path: str) -> _FastLock:
         """
         Get or create lock with LRU eviction / 获取或创建锁（带 LRU 驱逐）
         
+        The caller holds a reference until _release_lock(); referenced locks
+        are never evicted, so two tasks can never end up with different locks
+        for the same file.
+        调用者在 _release_lock() 之前持有引用；被引用的锁不会被驱逐。
+        
+        Synchronous on purpose: nothing here awaits, so no other task can run
+        in between and no guard lock is needed.
+        
         Args:
             normalized_path: Normalized file path / 规范化的文件路径
             
         Returns:
             Lock for the file / 文件的锁
         """
-        async with self._global_lock:
-            # Move to end if exists (mark as recently used)
-            if normalized_path in self._locks:
-                self._locks.move_to_end(normalized_path)
-                return self._locks[normalized_path]
-            
-            # Evict oldest if at capacity
-            if len(self._locks) >= self.max_locks:
-                oldest_path, oldest_lock = self._locks.popitem(last=False)
-                logger.info(f"🗑️ LRU evicted lock for: {oldest_path}")
-            
-            # Create new lock
-            new_lock = asyncio.Lock()
-            self._locks[normalized_path] = new_lock
-            self._lock_stats[normalized_path] = 0
-            logger.debug(f"🔒 Created new lock for: {normalized_path}")
-            
-            return new_lock
+        # Move to end if exists (mark as recently used)
+        if normalized_path in self._locks:
+            self._locks.move_to_end(normalized_path)
+            self._refcounts[normalized_path] += 1
+            return self._locks[normalized_path]
+        
+        # Evict oldest idle locks if at capacity; eviction returns them to the pool
+        if len(self._locks) >= self.max_locks:
+            self._evict_idle(len(self._locks) - self.max_locks + 1)
+        
+        # Rent a lock from the pool, allocating only when it is empty
+        new_lock = self._pool.pop() if self._pool else _FastLock()
+        self._locks[normalized_path] = new_lock
+        self._refcounts[normalized_path] = 1
+        self._lock_stats[normalized_path] = 0
+        logger.debug(f"🔒 Created new lock for: {normalized_path}")
+        
+        return new_lock
+    
+    def _evict_idle(self, count: int):
+        """
+        Evict up to count least recently used unreferenced locks / 驱逐最久未使用的空闲锁
+        
+        Args:
+            count: Number of locks to evict / 要驱逐的锁数量
+        """
+        victims = []
+        for path in self._locks:  # Oldest first
+            if len(victims) >= count:
+                break
+            # Held or awaited locks stay: evicting one would split the key in two
+            if not self._refcounts[path]:
+                victims.append(path)
+        
+        for path in victims:
+            self._pool.append(self._locks.pop(path))
+            del self._refcounts[path]
+            logger.info(f"🗑️ LRU evicted lock for: {path}")
+    
+    def _release_lock(self, normalized_path: str):
+        """
+        Drop one reference taken by _get_or_create_lock / 释放一个引用
+        
+        Args:
+            normalized_path: Normalized file path / 规范化的文件路径
+        """
+        self._refcounts[normalized_path] -= 1
+        # Capacity may have been exceeded while every lock was referenced
+        if len(self._locks) > self.max_locks:
+            self._evict_idle(len(self._locks) - self.max_locks)
     
     @asynccontextmanager
     async def lock_file(self, file_path: str, timeout: Optional[float] = None):
@@ -112,16 +190,19 @@ class FileLockManager:
                 write_config(data)
         """
         # Normalize path to avoid different representations of same file
-        normalized_path = str(Path(file_path).resolve())
+        normalized_path = _resolve(os.path.abspath(file_path))
         
         # Get or create lock for this file
-        file_lock = await self._get_or_create_lock(normalized_path)
+        file_lock = self._get_or_create_lock(normalized_path)
         
         logger.debug(f"⏳ Waiting for lock: {normalized_path}")
         
         lock_acquired = False
         try:
-            if timeout:
+            if file_lock._can_acquire_now():
+                # Uncontended: acquire() completes without suspending, no timeout needed
+                await file_lock.acquire()
+            elif timeout:
                 # Wait with timeout
                 await asyncio.wait_for(file_lock.acquire(), timeout=timeout)
             else:
@@ -148,6 +229,7 @@ class FileLockManager:
             if lock_acquired and file_lock.locked():
                 file_lock.release()
                 logger.debug(f"🔓 Lock released: {normalized_path}")
+            self._release_lock(normalized_path)
     
     def _log_timeout_event(self, file_path: str, timeout: float):
         """
@@ -241,6 +323,17 @@ class FileLockManager:
         else:
             await asyncio.gather(*tasks)
     
+    @staticmethod
+    def clear_path_cache():
+        """
+        Forget memoized path resolutions / 清除路径解析缓存
+        
+        Call after files are renamed, unlinked or re-symlinked so the next
+        lock_file() resolves them again.
+        文件被重命名、删除或修改符号链接后调用。
+        """
+        _resolve.cache_clear()
+    
     def clear_stats(self):
         """Clear lock statistics / 清除锁统计"""
         self._lock_stats.clear()
@@ -13,7 +13,8 @@ import re
 from pathlib import Path
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
-from threading import Timer, Lock
+from threading import Condition, Lock, Thread
+from concurrent.futures import ThreadPoolExecutor
 from antigravity.core.autonomous_auditor import AutonomousAuditor as Auditor
 from antigravity.infrastructure.test_runner import run_tests_for_file
 from antigravity.utils.config import CONFIG
@@ -29,9 +30,21 @@ class AntigravityMonitor(FileSystemEventHandler):
         self.watch_root = Path(project_root).resolve()
         self.state_manager = StateManager(project_root)
         self.auditor = Auditor(project_root)
-        self.timers = {}
+        self.pending = {}  # file -> monotonic time its debounce window closes
         self.debounce_seconds = 3.0
+        self._now = time.monotonic  # Replaceable clock, so tests need not sleep
         self.execution_lock = Lock()
+        # One debounce thread for all files, started by the first event.
+        # Own lock: a long project sync holds execution_lock, and events must not wait on it
+        self._wakeup = Condition(Lock())
+        self._debounce_thread = None
+        self._stopped = False
+        # Takeovers run for minutes; the debounce thread only hands them out,
+        # so files still take over in parallel (threads start on demand).
+        # At most MAX_PARALLEL_TAKEOVERS run at once, the rest wait their turn
+        self._takeover_pool = ThreadPoolExecutor(
+            max_workers=CONFIG.get('MAX_PARALLEL_TAKEOVERS', 4), thread_name_prefix='monitor-takeover')
+        self._queued_files = set()  # Handed to a takeover that has not finished yet (guarded by _wakeup)
         self.processing_files = set()
         self.change_detector = ChangeDetector(project_root)
         self.incremental_threshold = CONFIG.get('INCREMENTAL_THRESHOLD', 3)
@@ -67,11 +80,83 @@ class AntigravityMonitor(FileSystemEventHandler):
             return
         if filename in self.processing_files:
             return
-        if filename in self.timers:
-            self.timers[filename].cancel()
-        timer = Timer(self.debounce_seconds, self.trigger_takeover, args=[filename])
-        self.timers[filename] = timer
-        timer.start()
+        with self._wakeup:
+            if self._stopped or filename in self._queued_files:
+                return
+            self.pending[filename] = self._now() + self.debounce_seconds
+            if self._debounce_thread is None:
+                self._debounce_thread = Thread(target=self._debounce_loop, name='monitor-debounce', daemon=True)
+                self._debounce_thread.start()
+            self._wakeup.notify()
+
+    def _debounce_loop(self):
+        """
+        Sleep until the earliest debounce window closes, then hand the due
+        files to the takeover pool.
+        等待最早的防抖窗口结束后,将到期文件交给接管线程池
+
+        A burst of events on many files costs one thread, not one Timer each.
+        """
+        while True:
+            with self._wakeup:
+                while not self.pending and not self._stopped:
+                    self._wakeup.wait()
+                if self._stopped:
+                    return
+                delay = min(self.pending.values()) - self._now()
+                if delay > 0:
+                    self._wakeup.wait(delay)
+                    continue
+                # Submitted under the lock, so stop() cannot shut the pool in between
+                for filename in self._pop_due(self._now()):
+                    self._queued_files.add(filename)
+                    self._takeover_pool.submit(self._safe_takeover, filename)
+
+    def stop(self):
+        """
+        Stop debouncing for good: pending files are dropped and later events
+        ignored. Takeovers already running are left to finish.
+        """
+        with self._wakeup:
+            self._stopped = True
+            self.pending.clear()
+            self._wakeup.notify()
+            self._takeover_pool.shutdown(wait=False, cancel_futures=True)
+
+    def flush_due(self, now=None):
+        """
+        Take over every file whose debounce window has closed.
+        触发所有防抖窗口已结束的文件
+
+        Runs the takeovers in the calling thread, one after another; the
+        debounce thread uses the takeover pool instead. Tests call it
+        directly with a virtual now. Returns the files that were triggered.
+        """
+        if now is None:
+            now = self._now()
+        with self._wakeup:
+            due = self._pop_due(now)
+            self._queued_files.update(due)
+        for filename in due:
+            self._safe_takeover(filename)
+        return due
+
+    def _pop_due(self, now):
+        """Remove and return the files due at now (caller holds _wakeup)."""
+        due = [f for f, deadline in self.pending.items() if deadline <= now]
+        for filename in due:
+            del self.pending[filename]
+        return due
+
+    def _safe_takeover(self, filename):
+        try:
+            self.trigger_takeover(filename)
+        except Exception as e:
+            # One failed takeover must not take down its worker or the others
+            print(f'⚠️ Takeover failed for {filename}: {e}')
+        finally:
+            with self._wakeup:
+                self._queued_files.discard(filename)
 
     def _trigger_env_check(self):
         """
@@ -303,7 +388,8 @@ if __name__ == '__main__':
         print(f'Env Check Warning: {e}')
     print(f'Antigravity Monitor started at {os.path.abspath(path)}')
     observer = Observer()
-    observer.schedule(AntigravityMonitor(path), path, recursive=True)
+    monitor = AntigravityMonitor(path)
+    observer.schedule(monitor, path, recursive=True)
     observer.start()
     try:
         print("🧠 Monitor Heartbeat Active: Listening for Mission State...")
@@ -399,4 +485,5 @@ if __name__ == '__main__':
                 
     except KeyboardInterrupt:
         observer.stop()
+        monitor.stop()
     observer.join()
\ No newline at end of file
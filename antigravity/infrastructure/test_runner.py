@@ -1,9 +1,13 @@
 import subprocess
 import os
 import re
+import shutil
 from antigravity.utils.utils import get_related_test
 from antigravity.infrastructure.notifier import alert_critical
 
+# Resolved once, so a rollback does not search PATH for git on every call
+_GIT = shutil.which('git') or 'git'
+
 def run_tests_for_file(file_path):
     """
     运行单个文件的相关测试
@@ -34,7 +38,8 @@ def auto_rollback():
     """
     print('Initiating Auto-Rollback...')
     try:
-        subprocess.run(['git', 'stash', 'save', 'Antigravity broken attempt'], check=True)
+        subprocess.run([_GIT, 'stash', 'save', 'Antigravity broken attempt'], check=True,
+                       close_fds=False, stdin=subprocess.DEVNULL)
         print('Auto-executed Git Stash, code rolled back to stable state.')
         alert_critical('Code rolled back due to critical test failure!')
     except subprocess.CalledProcessError as e:
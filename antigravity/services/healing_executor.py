@@ -9,8 +9,9 @@ Phase 21 P2 Step 3: Interactive Healing Integration
 Phase 21 P2 Final Tuning: Shadow Validation Integration (审查官 Enhancement)
 """
 import asyncio
+import os
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 import json
 
 class HealingExecutor:
@@ -31,6 +32,64 @@ class HealingExecutor:
         self.project_root = project_root
         from .shadow_validator import ShadowValidator
         self.shadow_validator = ShadowValidator(project_root)
+        # Source text per file, keyed by (mtime_ns, size) / 按 (mtime_ns, 大小) 缓存的源码
+        self._source_cache: Dict[Path, Tuple[Tuple[int, int], str]] = {}
+        # Uncovered files from coverage.json, keyed by (mtime_ns, size) / 未覆盖文件缓存
+        self._coverage_cache: Optional[Tuple[Tuple[int, int], List[Path]]] = None
+
+    def _iter_sources(self) -> Iterator[Tuple[Path, str]]:
+        """
+        Yield (path, content) for every readable .py file / 遍历所有可读 .py 文件
+        
+        One walk that prunes __pycache__ directories; a file is only read
+        again after its mtime or size changes, so the analyzers share reads.
+        单次遍历并跳过 __pycache__；文件未变化时复用缓存内容，分析器共享读取结果。
+        """
+        seen = set()
+        for dirpath, dirnames, filenames in os.walk(self.project_root):
+            dirnames[:] = [d for d in dirnames if d != '__pycache__']
+            for name in filenames:
+                if not name.endswith('.py'):
+                    continue
+                py_file = Path(dirpath, name)
+                seen.add(py_file)
+                try:
+                    st = py_file.stat()
+                    key = (st.st_mtime_ns, st.st_size)
+                    cached = self._source_cache.get(py_file)
+                    if cached is None or cached[0] != key:
+                        cached = (key, py_file.read_text(encoding='utf-8'))
+                        self._source_cache[py_file] = cached
+                except Exception:
+                    continue
+                yield py_file, cached[1]
+        # Forget files that were deleted since the last walk (only after a full walk)
+        for stale in self._source_cache.keys() - seen:
+            del self._source_cache[stale]
+
+    async def _load_sources(self) -> List[Tuple[Path, str]]:
+        """Walk and read sources in a worker thread / 在工作线程中遍历并读取源码"""
+        return await asyncio.to_thread(lambda: list(self._iter_sources()))
+
+    async def analyze_all(self) -> Dict[str, object]:
+        """
+        Run every analyzer over one shared walk / 基于一次遍历运行全部分析器
+        
+        Sources are read once off the event loop, then the analyzers run
+        concurrently against that snapshot.
+        源码在事件循环外只读取一次，随后各分析器并发处理同一快照。
+        
+        Returns:
+            Results keyed by 'uncovered', 'quality', 'security', 'logic' / 各分析结果
+        """
+        sources = await self._load_sources()
+        uncovered, quality, security, logic = await asyncio.gather(
+            self._analyze_uncovered_code(),
+            self._analyze_quality_issues(sources),
+            self._analyze_security_issues(sources),
+            self._analyze_logic_issues(sources),
+        )
+        return {'uncovered': uncovered, 'quality': quality, 'security': security, 'logic': logic}
 
     async def heal_test_coverage(self, issue: str, previous_score: float=0) -> Dict:
         """
@@ -147,92 +206,95 @@ class HealingExecutor:
             List of uncovered files / 未覆盖文件列表
         """
         coverage_file = self.project_root / 'coverage.json'
-        if not coverage_file.exists():
+        try:
+            st = coverage_file.stat()
+        except FileNotFoundError:
             return []
+        # coverage.py reports can be tens of MB; parse each version only once
+        key = (st.st_mtime_ns, st.st_size)
+        if self._coverage_cache is not None and self._coverage_cache[0] == key:
+            return list(self._coverage_cache[1])
         try:
-            with open(coverage_file, 'r', encoding='utf-8') as f:
-                coverage_data = json.load(f)
+            coverage_data = json.loads(await asyncio.to_thread(coverage_file.read_bytes))
             uncovered_files = []
             for file_path, data in coverage_data.get('files', {}).items():
                 coverage_percent = data.get('summary', {}).get('percent_covered', 100)
                 if coverage_percent < 80:
                     uncovered_files.append(Path(file_path))
-            return uncovered_files
+            self._coverage_cache = (key, uncovered_files)
+            return list(uncovered_files)
         except Exception as e:
             print(f'Failed to analyze coverage: {e}')
             return []
 
-    async def _analyze_quality_issues(self) -> Dict[Path, List[str]]:
+    async def _analyze_quality_issues(self, sources: Optional[List[Tuple[Path, str]]]=None) -> Dict[Path, List[str]]:
         """
         Analyze code quality issues / 分析代码质量问题
         
+        Args:
+            sources: Pre-read (path, content) pairs / 预读取的 (路径, 内容) 列表
+            
         Returns:
             Dictionary of file paths to issue types / 文件路径到问题类型的字典
         """
+        if sources is None:
+            sources = await self._load_sources()
         issues = {}
-        for py_file in self.project_root.rglob('*.py'):
-            if 'test' in py_file.name or '__pycache__' in str(py_file):
+        for py_file, content in sources:
+            if 'test' in py_file.name:
                 continue
             file_issues = []
-            try:
-                with open(py_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                if 'def ' in content and '"""' not in content:
-                    file_issues.append('missing_docstring')
-                if '_unused' in content or 'temp_' in content:
-                    file_issues.append('unused_variable')
-                if file_issues:
-                    issues[py_file] = file_issues
-            except Exception:
-                continue
+            if 'def ' in content and '"""' not in content:
+                file_issues.append('missing_docstring')
+            if '_unused' in content or 'temp_' in content:
+                file_issues.append('unused_variable')
+            if file_issues:
+                issues[py_file] = file_issues
         return issues
 
-    async def _analyze_security_issues(self) -> Dict[Path, List[tuple]]:
+    async def _analyze_security_issues(self, sources: Optional[List[Tuple[Path, str]]]=None) -> Dict[Path, List[tuple]]:
         """
         Analyze security issues / 分析安全问题
         
+        Args:
+            sources: Pre-read (path, content) pairs / 预读取的 (路径, 内容) 列表
+            
         Returns:
             Dictionary of file paths to security issues / 文件路径到安全问题的字典
         """
+        if sources is None:
+            sources = await self._load_sources()
         issues = {}
-        for py_file in self.project_root.rglob('*.py'):
-            if '__pycache__' in str(py_file):
-                continue
+        for py_file, content in sources:
             file_issues = []
-            try:
-                with open(py_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                if 'api_key = "' in content.lower() or 'password = "' in content.lower():
-                    file_issues.append(('hardcoded_secret', 'API key or password'))
-                if 'eval(' in content or 'exec(' in content:
-                    file_issues.append(('unsafe_function', 'eval/exec'))
-                if file_issues:
-                    issues[py_file] = file_issues
-            except Exception:
-                continue
+            lowered = content.lower()
+            if 'api_key = "' in lowered or 'password = "' in lowered:
+                file_issues.append(('hardcoded_secret', 'API key or password'))
+            if 'eval(' in content or 'exec(' in content:
+                file_issues.append(('unsafe_function', 'eval/exec'))
+            if file_issues:
+                issues[py_file] = file_issues
         return issues
 
-    async def _analyze_logic_issues(self) -> Dict[Path, List[tuple]]:
+    async def _analyze_logic_issues(self, sources: Optional[List[Tuple[Path, str]]]=None) -> Dict[Path, List[tuple]]:
         """
         Analyze logic issues / 分析逻辑问题
         
+        Args:
+            sources: Pre-read (path, content) pairs / 预读取的 (路径, 内容) 列表
+            
         Returns:
             Dictionary of file paths to logic issues / 文件路径到逻辑问题的字典
         """
+        if sources is None:
+            sources = await self._load_sources()
         issues = {}
-        for py_file in self.project_root.rglob('*.py'):
-            if '__pycache__' in str(py_file):
-                continue
+        for py_file, content in sources:
             file_issues = []
-            try:
-                with open(py_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                if 'x = ' in content or 'temp = ' in content:
-                    file_issues.append(('poor_naming', 'Single-letter variables'))
-                if 'threading' in content and 'Lock' not in content:
-                    file_issues.append(('race_condition', 'Threading without locks'))
-                if file_issues:
-                    issues[py_file] = file_issues
-            except Exception:
-                continue
+            if 'x = ' in content or 'temp = ' in content:
+                file_issues.append(('poor_naming', 'Single-letter variables'))
+            if 'threading' in content and 'Lock' not in content:
+                file_issues.append(('race_condition', 'Threading without locks'))
+            if file_issues:
+                issues[py_file] = file_issues
         return issues
\ No newline at end of file
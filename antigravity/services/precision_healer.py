@@ -11,10 +11,14 @@ Phase 21 P2 Final Tuning (审查官 Enhancement):
 - Automatic prioritization of high-ROI fixes
 """
 
+import heapq
+from operator import attrgetter
 from typing import Dict, List, Tuple
 from dataclasses import dataclass
 from enum import Enum
 
+_BY_ROI = attrgetter('roi')
+
 
 class IssueSeverity(Enum):
     """Issue severity levels / 问题严重级别"""
@@ -32,7 +36,7 @@ class IssueDeduction:
     category: str
 
 
-@dataclass
+@dataclass(slots=True)
 class HealingTask:
     """Healing task with ROI / 带 ROI 的修复任务"""
     issue_type: str
@@ -83,6 +87,53 @@ class PrecisionHealer:
         'fix_circular_dependency': 8,
     }
     
+    # Keyword rules for _categorize_issue, checked in order; first hit wins
+    # 分类关键词规则，按顺序匹配，首个命中生效
+    # (keywords, issue_type, severity, potential_gain)
+    CATEGORY_RULES = (
+        # CRITICAL
+        (('syntax',), 'syntax_error', IssueSeverity.CRITICAL, 25),
+        (('secret', 'api_key', 'password'), 'hardcoded_secret', IssueSeverity.CRITICAL, 25),
+        (('eval', 'exec'), 'unsafe_function', IssueSeverity.CRITICAL, 25),
+        (('circular', 'dependency'), 'circular_dependency', IssueSeverity.CRITICAL, 25),
+        # WARNING ('core' turns low_coverage into missing_core_test)
+        (('complexity',), 'high_complexity', IssueSeverity.WARNING, 10),
+        (('coverage', 'test'), 'low_coverage', IssueSeverity.WARNING, 10),
+        (('race', 'concurrency'), 'race_condition', IssueSeverity.WARNING, 10),
+        # STYLE
+        (('docstring', 'documentation'), 'missing_docstring', IssueSeverity.STYLE, 3),
+        (('unused', 'variable'), 'unused_variable', IssueSeverity.STYLE, 3),
+        (('naming', 'name'), 'poor_naming', IssueSeverity.STYLE, 3),
+    )
+    
+    # Issue type -> DIFFICULTY_ESTIMATES key / 问题类型到难度键的映射
+    ISSUE_ACTIONS = {
+        'missing_docstring': 'add_docstring',
+        'unused_variable': 'remove_unused_variable',
+        'poor_naming': 'improve_naming',
+        'low_coverage': 'add_test',
+        'missing_core_test': 'add_test',
+        'hardcoded_secret': 'fix_security',
+        'unsafe_function': 'fix_security',
+        'high_complexity': 'refactor_complexity',
+        'race_condition': 'fix_race_condition',
+        'circular_dependency': 'fix_circular_dependency',
+    }
+    
+    # Issue type -> healing action label / 问题类型到修复动作的映射
+    HEALING_ACTIONS = {
+        'missing_docstring': '🧪 补充文档字符串',
+        'unused_variable': '✨ 移除未使用变量',
+        'poor_naming': '🎨 优化变量命名',
+        'low_coverage': '🧪 补充测试用例',
+        'missing_core_test': '🧪 补充核心模块测试',
+        'hardcoded_secret': '🔒 迁移密钥到环境变量',
+        'unsafe_function': '🔒 替换危险函数',
+        'high_complexity': '🎨 重构复杂函数',
+        'race_condition': '🎨 修复竞态条件',
+        'circular_dependency': '🎨 解除循环依赖',
+    }
+    
     def __init__(self):
         """Initialize precision healer / 初始化精准修复器"""
         pass
@@ -125,7 +176,7 @@ class PrecisionHealer:
             ))
         
         # Sort by ROI (highest first)
-        tasks.sort(key=lambda t: t.roi, reverse=True)
+        tasks.sort(key=_BY_ROI, reverse=True)
         
         return tasks
     
@@ -141,34 +192,12 @@ class PrecisionHealer:
         """
         issue_lower = issue.lower()
         
-        # Check for CRITICAL issues
-        if 'syntax' in issue_lower or 'syntaxerror' in issue_lower:
-            return ('syntax_error', IssueSeverity.CRITICAL, 25)
-        elif 'secret' in issue_lower or 'api_key' in issue_lower or 'password' in issue_lower:
-            return ('hardcoded_secret', IssueSeverity.CRITICAL, 25)
-        elif 'eval' in issue_lower or 'exec' in issue_lower:
-            return ('unsafe_function', IssueSeverity.CRITICAL, 25)
-        elif 'circular' in issue_lower or 'dependency' in issue_lower:
-            return ('circular_dependency', IssueSeverity.CRITICAL, 25)
-        
-        # Check for WARNING issues
-        elif 'complexity' in issue_lower:
-            return ('high_complexity', IssueSeverity.WARNING, 10)
-        elif 'coverage' in issue_lower or 'test' in issue_lower:
-            if 'core' in issue_lower:
-                return ('missing_core_test', IssueSeverity.WARNING, 10)
-            else:
-                return ('low_coverage', IssueSeverity.WARNING, 10)
-        elif 'race' in issue_lower or 'concurrency' in issue_lower:
-            return ('race_condition', IssueSeverity.WARNING, 10)
-        
-        # Check for STYLE issues
-        elif 'docstring' in issue_lower or 'documentation' in issue_lower:
-            return ('missing_docstring', IssueSeverity.STYLE, 3)
-        elif 'unused' in issue_lower or 'variable' in issue_lower:
-            return ('unused_variable', IssueSeverity.STYLE, 3)
-        elif 'naming' in issue_lower or 'name' in issue_lower:
-            return ('poor_naming', IssueSeverity.STYLE, 3)
+        for keywords, issue_type, severity, potential_gain in self.CATEGORY_RULES:
+            for keyword in keywords:
+                if keyword in issue_lower:
+                    if issue_type == 'low_coverage' and 'core' in issue_lower:
+                        issue_type = 'missing_core_test'
+                    return (issue_type, severity, potential_gain)
         
         # Default to STYLE
         return ('unknown', IssueSeverity.STYLE, 3)
@@ -183,21 +212,7 @@ class PrecisionHealer:
         Returns:
             Difficulty (1-10) / 难度 (1-10)
         """
-        # Map issue types to healing actions
-        action_map = {
-            'missing_docstring': 'add_docstring',
-            'unused_variable': 'remove_unused_variable',
-            'poor_naming': 'improve_naming',
-            'low_coverage': 'add_test',
-            'missing_core_test': 'add_test',
-            'hardcoded_secret': 'fix_security',
-            'unsafe_function': 'fix_security',
-            'high_complexity': 'refactor_complexity',
-            'race_condition': 'fix_race_condition',
-            'circular_dependency': 'fix_circular_dependency',
-        }
-        
-        action = action_map.get(issue_type, 'unknown')
+        action = self.ISSUE_ACTIONS.get(issue_type, 'unknown')
         return self.DIFFICULTY_ESTIMATES.get(action, 5)
     
     def _determine_healing_action(self, issue_type: str) -> str:
@@ -210,20 +225,7 @@ class PrecisionHealer:
         Returns:
             Healing action / 修复动作
         """
-        action_map = {
-            'missing_docstring': '🧪 补充文档字符串',
-            'unused_variable': '✨ 移除未使用变量',
-            'poor_naming': '🎨 优化变量命名',
-            'low_coverage': '🧪 补充测试用例',
-            'missing_core_test': '🧪 补充核心模块测试',
-            'hardcoded_secret': '🔒 迁移密钥到环境变量',
-            'unsafe_function': '🔒 替换危险函数',
-            'high_complexity': '🎨 重构复杂函数',
-            'race_condition': '🎨 修复竞态条件',
-            'circular_dependency': '🎨 解除循环依赖',
-        }
-        
-        return action_map.get(issue_type, '🔧 通用修复')
+        return self.HEALING_ACTIONS.get(issue_type, '🔧 通用修复')
     
     def get_recommended_fixes(self, tasks: List[HealingTask], max_tasks: int = 3) -> List[HealingTask]:
         """
@@ -238,7 +240,8 @@ class PrecisionHealer:
         Returns:
             Top recommended tasks / 推荐任务列表
         """
-        return tasks[:max_tasks]
+        # O(N log K) partial selection; same order as a stable full sort
+        return heapq.nlargest(max_tasks, tasks, key=_BY_ROI)
     
     def format_healing_recommendation(self, task: HealingTask) -> str:
         """
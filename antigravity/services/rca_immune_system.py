@@ -17,17 +17,99 @@ Think of it as the "immune system" - it fights off infections (errors) automatic
 """
 
 import sys
+import builtins
 import traceback
 import subprocess
 import re
-from typing import Dict, List, Optional, Tuple
+import time
+import heapq
+import functools
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+from collections import OrderedDict, deque
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 import json
 
 
-@dataclass
+IMPORT_ERROR_TYPES = frozenset({'ImportError', 'ModuleNotFoundError'})
+MISSING_MODULE_PATTERN = re.compile(r"No module named '(\w+)'")
+
+# Error type -> severity (轻症 LOW / 中症 MEDIUM / 重症 HIGH); unknown types are MEDIUM
+ERROR_SEVERITY = {
+    # Low severity - easy to fix
+    'SyntaxError': 'LOW', 'IndentationError': 'LOW', 'ImportError': 'LOW', 'ModuleNotFoundError': 'LOW',
+    # Medium severity - might need some work
+    'NameError': 'MEDIUM', 'AttributeError': 'MEDIUM', 'KeyError': 'MEDIUM', 'IndexError': 'MEDIUM',
+    # High severity - complex issues
+    'DesignError': 'HIGH', 'LogicError': 'HIGH', 'RuntimeError': 'HIGH', 'ValueError': 'HIGH',
+}
+
+
+# Bounded LRU of formatted tracebacks; the oldest entry is evicted first
+TRACEBACK_CACHE_SIZE = 1024
+# Printed from more than type, message and frames (SyntaxError: offset and
+# source text; exception groups: every nested exception) - never cached
+_UNCACHED_ERROR_TYPES = (SyntaxError,) + (
+    (builtins.BaseExceptionGroup,) if hasattr(builtins, 'BaseExceptionGroup') else ()
+)
+_traceback_cache: 'OrderedDict[Tuple, str]' = OrderedDict()
+
+
+def _format_traceback(error: BaseException) -> str:
+    """
+    Format an exception's traceback, reusing identical recent ones / 格式化回溯(带缓存)
+    
+    Retry storms raise the same error from the same frames again and again.
+    The key is the type, the message and (code, line, instruction) of every
+    frame, so two errors share an entry only when format_exception would print
+    the same text. At most TRACEBACK_CACHE_SIZE strings are kept, so a
+    long-running auditor stays bounded. Chained errors, syntax errors and
+    exception groups are always formatted fresh.
+    """
+    if (isinstance(error, _UNCACHED_ERROR_TYPES) or error.__cause__ is not None
+            or error.__context__ is not None or getattr(error, '__notes__', None)):
+        return ''.join(traceback.format_exception(type(error), error, error.__traceback__))
+    
+    frames = []
+    tb = error.__traceback__
+    while tb is not None:
+        frames.append((tb.tb_frame.f_code, tb.tb_lineno, tb.tb_lasti))
+        tb = tb.tb_next
+    key = (type(error), str(error), tuple(frames))
+    
+    tb_str = _traceback_cache.get(key)
+    if tb_str is not None:
+        _traceback_cache.move_to_end(key)
+        return tb_str
+    
+    tb_str = ''.join(traceback.format_exception(type(error), error, error.__traceback__))
+    _traceback_cache[key] = tb_str
+    if len(_traceback_cache) > TRACEBACK_CACHE_SIZE:
+        _traceback_cache.popitem(last=False)
+    return tb_str
+
+
+@functools.lru_cache(maxsize=8192)
+def _fuzzy_signature(error_type: str, file_path: Optional[str], line_number: Optional[int],
+                     message: Optional[str]) -> str:
+    """
+    Memoized body of RCAImmuneSystem._generate_error_signature / 缓存的指纹生成
+    
+    message is only passed for import errors, so every other error type
+    shares one cache entry per location no matter what its message says.
+    """
+    # For import errors, key on the missing module instead of the location
+    if message is not None:
+        match = MISSING_MODULE_PATTERN.search(message)
+        if match:
+            return f"{error_type}:module={match.group(1)}"
+    
+    # Use error type + file + line (ignore message)
+    return f"{error_type}:{file_path}:{line_number}"
+
+
+@dataclass(slots=True, frozen=True)
 class ErrorSnapshot:
     """
     Error snapshot - 错误快照
@@ -60,7 +142,7 @@ class ErrorSnapshot:
         }
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class FixResult:
     """
     Fix result - 修复结果
@@ -105,22 +187,26 @@ class RCAImmuneSystem:
     MAX_HEALING_DEPTH = 3  # 免疫疲劳阈值 - Maximum healing attempts
     COOLDOWN_PERIOD = 300  # 冷却期 (5 minutes in seconds)
     
-    def __init__(self, project_root: Optional[Path] = None):
+    def __init__(self, project_root: Optional[Path] = None, clock: Callable[[], float] = time.monotonic):
         """
         Initialize immune system / 初始化免疫系统
         
         Args:
             project_root: Project root directory / 项目根目录
+            clock: Monotonic seconds for cooldowns; tests pass a fake / 冷却期时钟
         """
         self.project_root = project_root or Path(".")
+        self._clock = clock
         self.fix_history: List[Dict] = []
         self.error_patterns: Dict[str, int] = {}  # Track recurring errors
         
         # Phase 21: Healing stack for fatigue protection
-        self.healing_stack: List[str] = []  # Track healing chain
+        self.healing_stack: Deque[str] = deque()  # Track healing chain (push/pop at the right end)
         
         # Phase 21 P0: Cooldown management
-        self.locked_projects: Dict[str, datetime] = {}  # project_id → lock_time
+        # project_id → expiry (self._clock()); the heap orders expiries for lazy sweeping
+        self._cooldown_until: Dict[str, float] = {}
+        self._cooldown_heap: List[Tuple[float, str]] = []
         
         # Auto-fix strategies
         self.auto_fix_strategies = {
@@ -144,17 +230,23 @@ class RCAImmuneSystem:
         Returns:
             Fuzzy error signature / 模糊错误指纹
         """
-        # Use error type + file + line (ignore message)
-        signature = f"{snapshot.error_type}:{snapshot.file_path}:{snapshot.line_number}"
+        message = snapshot.message if snapshot.error_type in IMPORT_ERROR_TYPES else None
+        return _fuzzy_signature(snapshot.error_type, snapshot.file_path, snapshot.line_number, message)
+    
+    def _leave_healing(self, error_signature: str):
+        """
+        Pop a signature off the healing stack / 将指纹移出愈合栈
         
-        # For import errors, include module name
-        if snapshot.error_type in ['ImportError', 'ModuleNotFoundError']:
-            match = re.search(r"No module named '(\w+)'", snapshot.message)
-            if match:
-                module = match.group(1)
-                signature = f"{snapshot.error_type}:module={module}"
+        Healing unwinds innermost-first, so the signature is normally on top
+        and this is an O(1) pop; otherwise fall back to removing it.
         
-        return signature
+        Args:
+            error_signature: Signature pushed by on_error_captured / 错误指纹
+        """
+        if self.healing_stack and self.healing_stack[-1] == error_signature:
+            self.healing_stack.pop()
+        elif error_signature in self.healing_stack:
+            self.healing_stack.remove(error_signature)
     
     def _lock_project(self, project_id: str):
         """
@@ -163,7 +255,9 @@ class RCAImmuneSystem:
         Args:
             project_id: Project identifier / 项目标识符
         """
-        self.locked_projects[project_id] = datetime.now()
+        expiry = self._clock() + self.COOLDOWN_PERIOD
+        self._cooldown_until[project_id] = expiry
+        heapq.heappush(self._cooldown_heap, (expiry, project_id))
         print(f"🔒 Project locked: {project_id}")
         print(f"   Cooldown period: {self.COOLDOWN_PERIOD}s ({self.COOLDOWN_PERIOD/60:.1f} minutes)")
     
@@ -177,19 +271,24 @@ class RCAImmuneSystem:
         Returns:
             True if in cooldown / 如果在冷却期则返回 True
         """
-        if project_id not in self.locked_projects:
-            return False
-        
-        lock_time = self.locked_projects[project_id]
-        elapsed = (datetime.now() - lock_time).total_seconds()
-        
-        if elapsed >= self.COOLDOWN_PERIOD:
-            # Cooldown expired, remove lock
-            del self.locked_projects[project_id]
-            print(f"🧊 Cooldown expired for project: {project_id}")
-            return False
+        self._sweep_cooldowns()
+        return project_id in self._cooldown_until
+    
+    def _sweep_cooldowns(self):
+        """
+        Drop expired project locks / 清除已过期的项目锁
         
-        return True
+        Pops expiries off the heap until the earliest is still in the future,
+        so the cost is paid once per lock rather than on every check.
+        Entries superseded by a re-lock are discarded without unlocking.
+        """
+        now = self._clock()
+        while self._cooldown_heap and self._cooldown_heap[0][0] <= now:
+            expiry, project_id = heapq.heappop(self._cooldown_heap)
+            if self._cooldown_until.get(project_id) == expiry:
+                # Cooldown expired, remove lock
+                del self._cooldown_until[project_id]
+                print(f"🧊 Cooldown expired for project: {project_id}")
     
     def _get_cooldown_remaining(self, project_id: str) -> float:
         """
@@ -201,12 +300,11 @@ class RCAImmuneSystem:
         Returns:
             Remaining cooldown time / 剩余冷却时间
         """
-        if project_id not in self.locked_projects:
+        expiry = self._cooldown_until.get(project_id)
+        if expiry is None:
             return 0.0
         
-        lock_time = self.locked_projects[project_id]
-        elapsed = (datetime.now() - lock_time).total_seconds()
-        return max(0, self.COOLDOWN_PERIOD - elapsed)
+        return max(0.0, expiry - self._clock())
     
     def on_error_captured(self, error: Exception, context: Optional[Dict] = None) -> FixResult:
         """
@@ -288,13 +386,12 @@ class RCAImmuneSystem:
                 if fix_result.success:
                     print(f"✅ Auto-fix successful: {fix_result.action}")
                     # Remove from healing stack on success
-                    self.healing_stack.remove(error_signature)
+                    self._leave_healing(error_signature)
                     return fix_result
                 else:
                     print(f"⚠️ Auto-fix failed: {fix_result.details}")
                     # Also remove from stack on failure to allow retry
-                    if error_signature in self.healing_stack:
-                        self.healing_stack.remove(error_signature)
+                    self._leave_healing(error_signature)
             
             # 7. Escalate to remote expert (升级到远程专家)
             if snapshot.retry_count > 2 or severity == 'HIGH':
@@ -302,8 +399,7 @@ class RCAImmuneSystem:
                 fix_result = self._escalate_to_expert(snapshot, context or {})
                 self._log_fix(snapshot, fix_result)
                 # Remove from healing stack after escalation
-                if error_signature in self.healing_stack:
-                    self.healing_stack.remove(error_signature)
+                self._leave_healing(error_signature)
                 return fix_result
             
             # 8. No fix available
@@ -315,14 +411,12 @@ class RCAImmuneSystem:
             )
             self._log_fix(snapshot, fix_result)
             # Remove from healing stack
-            if error_signature in self.healing_stack:
-                self.healing_stack.remove(error_signature)
+            self._leave_healing(error_signature)
             return fix_result
             
         except Exception as e:
             # Cleanup healing stack on exception
-            if error_signature in self.healing_stack:
-                self.healing_stack.remove(error_signature)
+            self._leave_healing(error_signature)
             raise
     
     def _force_expert_escalation(self, snapshot: ErrorSnapshot, context: Dict, depth: int) -> FixResult:
@@ -383,8 +477,8 @@ class RCAImmuneSystem:
         Returns:
             Error snapshot / 错误快照
         """
-        # Get traceback
-        tb_str = ''.join(traceback.format_exception(type(error), error, error.__traceback__))
+        # Get traceback (identical repeats come from the cache)
+        tb_str = _format_traceback(error)
         
         # Parse file and line info
         file_path, line_number, function_name = self._parse_traceback(tb_str)
@@ -445,22 +539,8 @@ class RCAImmuneSystem:
         Returns:
             Severity level: LOW, MEDIUM, HIGH / 严重性级别
         """
-        error_type = snapshot.error_type
-        
-        # Low severity - easy to fix
-        if error_type in ['SyntaxError', 'IndentationError', 'ImportError', 'ModuleNotFoundError']:
-            return 'LOW'
-        
-        # Medium severity - might need some work
-        if error_type in ['NameError', 'AttributeError', 'KeyError', 'IndexError']:
-            return 'MEDIUM'
-        
-        # High severity - complex issues
-        if error_type in ['DesignError', 'LogicError', 'RuntimeError', 'ValueError']:
-            return 'HIGH'
-        
         # Unknown - treat as medium
-        return 'MEDIUM'
+        return ERROR_SEVERITY.get(snapshot.error_type, 'MEDIUM')
     
     def _can_auto_fix(self, snapshot: ErrorSnapshot) -> bool:
         """
@@ -518,7 +598,7 @@ class RCAImmuneSystem:
             Fix result / 修复结果
         """
         # Extract module name
-        match = re.search(r"No module named '(\w+)'", snapshot.message)
+        match = MISSING_MODULE_PATTERN.search(snapshot.message)
         if not match:
             return FixResult(
                 success=False,
@@ -6,7 +6,7 @@ Ensures healing actions improve quality before committing changes.
 确保修复动作在提交变更前真正提升质量。
 
 Phase 21 P2 Final Tuning (审查官 Enhancement):
-- Snapshot protection (Git-based or filesystem)
+- Snapshot protection (Git-based or in-memory)
 - Silent audit after healing
 - Automatic rollback if score doesn't improve
 - Result comparison and decision making
@@ -16,7 +16,6 @@ import subprocess
 from pathlib import Path
 from typing import Dict, Optional
 from datetime import datetime
-import shutil
 import tempfile
 
 class ShadowValidator:
@@ -34,8 +33,9 @@ class ShadowValidator:
             project_root: Project root directory / 项目根目录
         """
         self.project_root = project_root
-        self.snapshots_dir = project_root / '.antigravity_snapshots'
-        self.snapshots_dir.mkdir(exist_ok=True)
+        # Pre-healing file contents per snapshot, held in RAM until restore/cleanup
+        # 每个快照修复前的文件内容，保存在内存中直到恢复/清理
+        self._memory_snapshots: Dict[str, Dict[Path, bytes]] = {}
 
     async def shadow_heal_and_verify(self, healing_func, issue_type: str, issue: str, previous_score: float) -> Dict:
         """
@@ -87,7 +87,11 @@ class ShadowValidator:
 
     async def _create_hot_snapshot(self) -> str:
         """
-        Create hot snapshot (Git or filesystem) / 创建热快照
+        Create hot snapshot (Git or in-memory) / 创建热快照
+        
+        Without Git, the bytes of every .py file are kept in memory; nothing
+        is written to disk until a rollback actually needs it.
+        无 Git 时将所有 .py 文件内容保存在内存中，只有回滚时才写盘。
         
         Returns:
             Snapshot ID / 快照 ID
@@ -101,17 +105,17 @@ class ShadowValidator:
                     return f'git:{snapshot_id}'
             except Exception as e:
                 print(f'   ⚠️ Git snapshot failed: {e}')
-        snapshot_dir = self.snapshots_dir / snapshot_id
-        snapshot_dir.mkdir(exist_ok=True)
+        files = {}
         for py_file in self.project_root.rglob('*.py'):
             if '.antigravity' in str(py_file) or '__pycache__' in str(py_file):
                 continue
-            rel_path = py_file.relative_to(self.project_root)
-            target = snapshot_dir / rel_path
-            target.parent.mkdir(parents=True, exist_ok=True)
-            shutil.copy2(py_file, target)
-        print(f'   📦 Filesystem snapshot created: {snapshot_id}')
-        return f'fs:{snapshot_id}'
+            try:
+                files[py_file] = py_file.read_bytes()
+            except OSError:
+                continue
+        self._memory_snapshots[snapshot_id] = files
+        print(f'   📦 Memory snapshot created: {snapshot_id}')
+        return f'mem:{snapshot_id}'
 
     async def _restore_hot_snapshot(self, snapshot_id: str):
         """
@@ -134,15 +138,19 @@ class ShadowValidator:
                     print(f'   ✅ Git snapshot restored: {stash_name}')
             except Exception as e:
                 print(f'   ❌ Git restore failed: {e}')
-        elif snapshot_id.startswith('fs:'):
-            snapshot_name = snapshot_id[3:]
-            snapshot_dir = self.snapshots_dir / snapshot_name
-            if snapshot_dir.exists():
-                for snapshot_file in snapshot_dir.rglob('*.py'):
-                    rel_path = snapshot_file.relative_to(snapshot_dir)
-                    target = self.project_root / rel_path
-                    shutil.copy2(snapshot_file, target)
-                print(f'   ✅ Filesystem snapshot restored: {snapshot_name}')
+        elif snapshot_id.startswith('mem:'):
+            snapshot_name = snapshot_id[4:]
+            files = self._memory_snapshots.pop(snapshot_name, None)
+            if files is not None:
+                for target, data in files.items():
+                    # Only rewrite files the healing actually changed or removed
+                    try:
+                        if target.read_bytes() == data:
+                            continue
+                    except OSError:
+                        target.parent.mkdir(parents=True, exist_ok=True)
+                    target.write_bytes(data)
+                print(f'   ✅ Memory snapshot restored: {snapshot_name}')
 
     async def _cleanup_snapshot(self, snapshot_id: str):
         """
@@ -164,11 +172,8 @@ class ShadowValidator:
                     subprocess.run(['git', 'stash', 'drop', stash_index], cwd=self.project_root)
             except Exception:
                 pass
-        elif snapshot_id.startswith('fs:'):
-            snapshot_name = snapshot_id[3:]
-            snapshot_dir = self.snapshots_dir / snapshot_name
-            if snapshot_dir.exists():
-                shutil.rmtree(snapshot_dir)
+        elif snapshot_id.startswith('mem:'):
+            self._memory_snapshots.pop(snapshot_id[4:], None)
 
     async def _silent_audit(self) -> float:
         """
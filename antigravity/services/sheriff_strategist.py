@@ -153,10 +153,12 @@ Output format (JSON):
         architecture_suggestions = []
         quality_score = 70  # Base score
         
+        # Look each plan section up once
+        deps = plan.get('dependencies', [])
+        files = plan.get('files_to_create', [])
+        
         # Check for common issues
-        if 'dependencies' in plan:
-            deps = plan['dependencies']
-            
+        if deps:
             # Suggest specific versions
             if any('==' not in dep for dep in deps):
                 optimizations.append(
@@ -171,9 +173,7 @@ Output format (JSON):
                 )
         
         # Check file structure
-        if 'files_to_create' in plan:
-            files = plan['files_to_create']
-            
+        if files:
             # Suggest __init__.py
             dirs = set(f.split('/')[0] for f in files if '/' in f)
             for dir in dirs:
@@ -185,7 +185,7 @@ Output format (JSON):
                     quality_score -= 3
         
         # Check for testing
-        if not any('test' in str(f).lower() for f in plan.get('files_to_create', [])):
+        if not any('test' in str(f).lower() for f in files):
             architecture_suggestions.append(
                 "Consider adding test files for quality assurance"
             )
@@ -16,6 +16,11 @@ from typing import Dict, List, Optional
 from dataclasses import dataclass, asdict
 from datetime import datetime
 import json
+import re
+
+# Shared decoder and whitespace skipper for parse_response / 响应解析共用的解码器与空白跳过器
+_JSON_DECODER = json.JSONDecoder()
+_WHITESPACE = re.compile(r'\s*')
 
 
 @dataclass
@@ -168,10 +173,11 @@ class StrategistProtocol:
         Returns:
             Formatted prompt / 格式化提示词
         """
-        # Format code snapshot
-        code_snapshot_str = ""
-        for file_path, code_content in request.code_snapshot.items():
-            code_snapshot_str += f"\n### {file_path}\n```python\n{code_content}\n```\n"
+        # Format code snapshot (one join instead of growing a string per file)
+        code_snapshot_str = "".join(
+            f"\n### {file_path}\n```python\n{code_content}\n```\n"
+            for file_path, code_content in request.code_snapshot.items()
+        )
         
         return self.REMOTE_AUDIT_PROMPT.format(
             project_name=request.project_name,
@@ -195,13 +201,17 @@ class StrategistProtocol:
             # Extract JSON from response (handle markdown code blocks)
             json_str = response_text.strip()
             
-            if '```json' in json_str:
-                json_str = json_str.split('```json')[1].split('```')[0].strip()
-            elif '```' in json_str:
-                json_str = json_str.split('```')[1].split('```')[0].strip()
+            if json_str.startswith('{'):
+                start = 0  # Bare JSON; fences inside string values are not block markers
+            elif '```json' in json_str:
+                start = json_str.index('```json') + len('```json')
+            else:
+                start = json_str.find('```')
+                start = start + len('```') if start != -1 else 0
             
-            # Parse JSON
-            data = json.loads(json_str)
+            # Parse JSON in place: raw_decode stops at the end of the object,
+            # so the closing fence and any trailing prose are never copied
+            data, _ = _JSON_DECODER.raw_decode(json_str, _WHITESPACE.match(json_str, start).end())
             
             # Validate required fields
             required_fields = ['logic_score', 'approved', 'debt_found', 'naming_vibe', 'expert_advice']
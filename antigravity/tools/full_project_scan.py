@@ -1,5 +1,6 @@
 
 import sys
+import json
 import argparse
 from pathlib import Path
 
@@ -52,6 +53,36 @@ def scan_and_clean(root_dir, clean_mode=False):
     print(f"\n📊 Summary: {len(cleaned_files)} files sanitized.")
     return cleaned_files
 
+def clean_knowledge_graph(graph_path, clean_mode=False):
+    """
+    Sanitize a knowledge graph JSON file value-by-value.
+
+    Runs the parsed graph through sanitize_for_protobuf, which replaces
+    unencodable characters in string values only; keys, numbers and the
+    JSON structure are left as they are. The file is rewritten only if a
+    value actually changed.
+    """
+    print(f"🧹 Knowledge Graph Clean (Clean Mode: {clean_mode})")
+    path = Path(graph_path)
+
+    try:
+        data = json.loads(path.read_text(encoding='utf-8'))
+    except Exception as e:
+        print(f"   ❌ Error {path.name}: {e}")
+        return False
+
+    safe_data = sanitize_for_protobuf(data)
+    if safe_data == data:
+        print(f"   ✅ Clean: {path.name}")
+        return False
+
+    if clean_mode:
+        path.write_text(json.dumps(safe_data, indent=2, ensure_ascii=False), encoding='utf-8')
+        print(f"   ✨ Sanitized: {path.name}")
+    else:
+        print(f"   ⚠️ Dirty File (Dry Run): {path.name}")
+    return True
+
 def scan_semantic(root_dir, output_file="fleet_knowledge_graph.json"):
     print(f"🧠 Semantic Topology Scan initiated...")
     print(f"   Target: {root_dir}")
@@ -88,12 +119,15 @@ def scan_semantic(root_dir, output_file="fleet_knowledge_graph.json"):
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("--clean", action="store_true", help="Apply changes in clean mode")
-    parser.add_argument("--mode", type=str, default="clean", choices=["clean", "semantic"], help="Scan mode")
+    parser.add_argument("--mode", type=str, default="clean", choices=["clean", "semantic", "graph"], help="Scan mode")
     parser.add_argument("--output", type=str, default="fleet_knowledge_graph.json", help="Output file for semantic scan")
+    parser.add_argument("--graph", type=str, default="fleet_knowledge_graph.json", help="Knowledge graph file to sanitize in graph mode")
     
     args = parser.parse_args()
     
     if args.mode == "semantic":
         scan_semantic(r"d:\桌面\AGENT", args.output)
+    elif args.mode == "graph":
+        clean_knowledge_graph(args.graph, clean_mode=args.clean)
     else:
         scan_and_clean(r"d:\桌面\AGENT", clean_mode=args.clean)
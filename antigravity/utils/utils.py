@@ -1,6 +1,7 @@
 import os
 import subprocess
 import fnmatch
+import functools
 
 def get_git_diff(repo_path, file_path=None):
     """
@@ -39,11 +40,13 @@ def get_tree_structure(root_dir, exclude_patterns=None):
                 tree_str += f"{subindent}{f}\n"
     return tree_str
 
+@functools.lru_cache(maxsize=4096)
 def get_related_test(file_path):
     """
     Map a source file to its corresponding test file.
     Heuristic: src/module/file.py -> tests/module/test_file.py
                src/file.py -> tests/test_file.py
+    Memoized: the monitor asks again every time the same file is saved.
     """
     # Normalize path separators
     file_path = file_path.replace('\\', '/')
@@ -9,10 +9,20 @@ NO REGEX. Pure AST semantic rewriting.
 
 import ast
 import json
+import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 import sys
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+LAYERS = ('core', 'services', 'infrastructure', 'interface', 'utils')
+
 
 class ImportRefactorer(ast.NodeTransformer):
     """AST-based import statement refactorer"""
@@ -47,12 +57,8 @@ class ImportRefactorer(ast.NodeTransformer):
                     old_module = node.module
                     new_module = f"antigravity.{target_layer}.{module_name}"
                     
-                    # Create new node
-                    new_node = ast.ImportFrom(
-                        module=new_module,
-                        names=node.names,
-                        level=node.level
-                    )
+                    # Rewrite in place (keeps lineno/col_offset)
+                    node.module = new_module
                     
                     self.changes.append({
                         'type': 'ImportFrom',
@@ -61,7 +67,7 @@ class ImportRefactorer(ast.NodeTransformer):
                         'line': node.lineno
                     })
                     
-                    return new_node
+                    return node
             
             # Case 2: from antigravity.layer.module import X (already correct)
             elif len(parts) == 3:
@@ -83,12 +89,9 @@ class ImportRefactorer(ast.NodeTransformer):
                     old_module = f"{'.' * node.level}{node.module}"
                     new_module = f"antigravity.{target_layer}.{target_module}"
                     
-                    # Convert to absolute import
-                    new_node = ast.ImportFrom(
-                        module=new_module,
-                        names=node.names,
-                        level=0  # Make it absolute
-                    )
+                    # Convert to absolute import in place
+                    node.module = new_module
+                    node.level = 0  # Make it absolute
                     
                     self.changes.append({
                         'type': 'ImportFrom (relative→absolute)',
@@ -97,16 +100,13 @@ class ImportRefactorer(ast.NodeTransformer):
                         'line': node.lineno
                     })
                     
-                    return new_node
+                    return node
         
         return node
     
     def visit_Import(self, node: ast.Import) -> ast.Import:
         """Rewrite 'import X' statements"""
         
-        new_names = []
-        changed = False
-        
         for alias in node.names:
             module_name = alias.name
             
@@ -119,13 +119,10 @@ class ImportRefactorer(ast.NodeTransformer):
                     target_layer = self.module_to_layer.get(module)
                     
                     if target_layer and target_layer != 'root':
-                        # Rewrite to layer-specific path
+                        # Rewrite the alias in place
                         old_name = module_name
                         new_name = f"antigravity.{target_layer}.{module}"
-                        
-                        new_alias = ast.alias(name=new_name, asname=alias.asname)
-                        new_names.append(new_alias)
-                        changed = True
+                        alias.name = new_name
                         
                         self.changes.append({
                             'type': 'Import',
@@ -133,20 +130,12 @@ class ImportRefactorer(ast.NodeTransformer):
                             'new': new_name,
                             'line': node.lineno
                         })
-                    else:
-                        new_names.append(alias)
-                else:
-                    new_names.append(alias)
-            else:
-                new_names.append(alias)
-        
-        if changed:
-            return ast.Import(names=new_names)
         
         return node
 
 
-def refactor_file(file_path: Path, mapping: Dict) -> Tuple[bool, List[Dict]]:
+def refactor_file(file_path: Path, mapping: Dict,
+                  current_layer: Optional[str] = None) -> Tuple[bool, List[Dict]]:
     """Refactor imports in a single file using AST"""
     
     try:
@@ -156,21 +145,12 @@ def refactor_file(file_path: Path, mapping: Dict) -> Tuple[bool, List[Dict]]:
         # Parse AST
         tree = ast.parse(content)
         
-        # Determine current file's layer
-        file_str = str(file_path)
-        current_layer = 'root'
+        # Determine current file's layer (unless the caller already knows it)
         current_module = file_path.stem
         
-        if 'core' in file_str:
-            current_layer = 'core'
-        elif 'services' in file_str:
-            current_layer = 'services'
-        elif 'infrastructure' in file_str:
-            current_layer = 'infrastructure'
-        elif 'interface' in file_str:
-            current_layer = 'interface'
-        elif 'utils' in file_str:
-            current_layer = 'utils'
+        if current_layer is None:
+            file_str = str(file_path)
+            current_layer = next((layer for layer in LAYERS if layer in file_str), 'root')
         
         # Apply refactoring
         refactorer = ImportRefactorer(mapping, current_layer, current_module)
@@ -192,6 +172,29 @@ def refactor_file(file_path: Path, mapping: Dict) -> Tuple[bool, List[Dict]]:
         return False, []
 
 
+def _ndjson_line(record: Dict) -> bytes:
+    """Encode one log record as an NDJSON line (orjson when available)"""
+    if orjson is not None:
+        return orjson.dumps(record) + b'\n'
+    return (json.dumps(record, ensure_ascii=False) + '\n').encode('utf-8')
+
+
+# Per-worker copy of the import mapping, set once by _init_worker
+_MAPPING: Optional[Dict] = None
+
+
+def _init_worker(mapping: Dict) -> None:
+    """Pool initializer: ship the mapping to each worker once, not per file"""
+    global _MAPPING
+    _MAPPING = mapping
+
+
+def _refactor_worker(item: Tuple[Path, str]) -> Tuple[bool, List[Dict]]:
+    """Pool task: only the (path, layer) pair crosses the process boundary"""
+    file_path, layer = item
+    return refactor_file(file_path, _MAPPING, layer)
+
+
 def main():
     """Main refactoring execution"""
     
@@ -212,41 +215,59 @@ def main():
     mapping = json.loads(mapping_file.read_text(encoding='utf-8'))
     print(f"✅ Loaded import mapping: {len(mapping['module_to_layer'])} modules")
     
-    # Find all Python files in antigravity layers
+    # Find all Python files in antigravity layers (one walk, layer recorded per file)
     antigravity_dir = Path("antigravity")
     python_files = []
     
-    for layer in ['core', 'services', 'infrastructure', 'interface', 'utils']:
-        layer_dir = antigravity_dir / layer
-        if layer_dir.exists():
-            python_files.extend(layer_dir.glob("*.py"))
-    
-    # Also check root antigravity files
-    for py_file in antigravity_dir.glob("*.py"):
-        if py_file.name != "__init__.py":
-            python_files.append(py_file)
+    for root, dirnames, filenames in os.walk(antigravity_dir):
+        if root == str(antigravity_dir):
+            layer = 'root'
+            dirnames[:] = [d for d in dirnames if d in LAYERS]
+        else:
+            layer = os.path.basename(root)
+            dirnames[:] = []  # Layers are scanned one level deep
+        
+        for filename in filenames:
+            if not filename.endswith('.py'):
+                continue
+            # Root __init__ only re-exports; layer __init__ files are included
+            if layer == 'root' and filename == '__init__.py':
+                continue
+            python_files.append((Path(root, filename), layer))
     
     print(f"📁 Found {len(python_files)} Python files to process")
     print()
     
-    # Refactor each file
+    # Refactor each file, streaming one NDJSON log record per modified file
     total_changes = 0
     files_modified = 0
-    all_changes = {}
+    log_file = Path(".antigravity_import_refactoring.ndjson")
     
-    for py_file in python_files:
-        modified, changes = refactor_file(py_file, mapping)
+    with open(log_file, 'wb') as log_fh, \
+            ProcessPoolExecutor(initializer=_init_worker, initargs=(mapping,)) as executor:
+        log_fh.write(_ndjson_line({
+            'version': '1.0.0',
+            'timestamp': '2026-02-07T19:36:00'
+        }))
         
-        if modified:
+        for (py_file, _), (modified, changes) in zip(python_files, executor.map(_refactor_worker, python_files)):
+            if not modified:
+                continue
+            
             files_modified += 1
             total_changes += len(changes)
-            all_changes[str(py_file)] = changes
+            log_fh.write(_ndjson_line({'file': str(py_file), 'changes': changes}))
             
             print(f"✅ {py_file.name}: {len(changes)} imports refactored")
             for change in changes[:3]:  # Show first 3
                 print(f"   Line {change['line']}: {change['old']} → {change['new']}")
             if len(changes) > 3:
                 print(f"   ... and {len(changes) - 3} more")
+        
+        log_fh.write(_ndjson_line({
+            'files_modified': files_modified,
+            'total_changes': total_changes
+        }))
     
     # Summary
     print()
@@ -256,17 +277,6 @@ def main():
     print(f"✅ Files modified: {files_modified}/{len(python_files)}")
     print(f"✅ Total imports refactored: {total_changes}")
     print()
-    
-    # Save detailed log
-    log_file = Path(".antigravity_import_refactoring.json")
-    log_data = {
-        'version': '1.0.0',
-        'timestamp': '2026-02-07T19:36:00',
-        'files_modified': files_modified,
-        'total_changes': total_changes,
-        'changes': all_changes
-    }
-    log_file.write_text(json.dumps(log_data, indent=2), encoding='utf-8')
     print(f"📝 Detailed log saved: {log_file}")
     
     if files_modified > 0:
@@ -5,38 +5,267 @@ Antigravity Parallel Startup Script
 并行启动 Monitor 和 Dashboard,带健康监控
 Launches both Monitor and Dashboard in parallel with health monitoring
 """
+import atexit
 import subprocess
 import sys
 import time
 import os
+import random
 import signal
+import threading
+from collections import deque
+
+
+# 子进程命令行: 首次启动与重启共用同一份,避免两处漂移
+# Child command lines, shared by first launch and restart so they cannot drift
+MONITOR_CMD = (sys.executable, "-m", "antigravity.infrastructure.monitor")
+DASHBOARD_CMD = (sys.executable, "-m", "streamlit", "run",
+                 "antigravity/interface/dashboard.py",
+                 "--server.headless", "true",
+                 "--server.port", "8501")
+
+# 监控器输出写入日志文件,而不是无人读取的管道或直接丢弃
+# Monitor output goes to a log file rather than an unread pipe or /dev/null
+MONITOR_LOG = os.path.join("debug_logs", "monitor.log")
+MONITOR_LOG_MAX_BYTES = 5 * 1024 * 1024
+
+
+# 中英双语提示表: 每条提示只调用一次 print(),而不是中英文各一次
+# Bilingual message table: one print() per message instead of one per language
+MSG = {
+    "starting": "🚀 正在启动 Antigravity 系统...\n🚀 Starting Antigravity System...\n" + "=" * 60,
+    "starting_monitor": "📡 正在启动监控代理...\n📡 Starting Monitor Agent...",
+    "monitor_started": "✅ 监控代理已启动 (进程ID: {pid})\n✅ Monitor Agent started (PID: {pid})",
+    "starting_dashboard": "🌐 正在启动 Web 面板...\n🌐 Starting Web Dashboard...",
+    "dashboard_started": "✅ Web 面板已启动 (进程ID: {pid})\n✅ Web Dashboard started (PID: {pid})",
+    "running": "\n".join([
+        "=" * 60,
+        "🎯 Antigravity 正在运行!",
+        "🎯 Antigravity is now running!",
+        "📊 面板地址 / Dashboard: http://localhost:8501",
+        "📝 监控日志 / Monitor log: " + MONITOR_LOG,
+        "🛑 按 Ctrl+C 停止所有服务 / Press Ctrl+C to stop all services",
+        "=" * 60,
+    ]),
+    "monitor_died": "❌ 监控进程意外退出 (退出码: {code})\n❌ Monitor process exited unexpectedly (code: {code})",
+    "monitor_gave_up": "💀 监控器在 {period:.0f} 秒内崩溃过多,放弃重启\n💀 FATAL: Monitor crashed too often within {period:.0f}s, giving up",
+    "monitor_restarting": "🔄 {delay:.1f} 秒后尝试重启监控器...\n🔄 Attempting to restart monitor in {delay:.1f}s...",
+    "monitor_restarted": "✅ 监控器已重启 (进程ID: {pid})\n✅ Monitor restarted (PID: {pid})",
+    "dashboard_died": "❌ 面板进程意外退出 (退出码: {code})\n❌ Dashboard process exited unexpectedly (code: {code})",
+    "dashboard_gave_up": "💀 面板在 {period:.0f} 秒内崩溃过多,放弃重启\n💀 FATAL: Dashboard crashed too often within {period:.0f}s, giving up",
+    "dashboard_restarting": "🔄 {delay:.1f} 秒后尝试重启面板...\n🔄 Attempting to restart dashboard in {delay:.1f}s...",
+    "dashboard_restarted": "✅ 面板已重启 (进程ID: {pid})\n✅ Dashboard restarted (PID: {pid})",
+    "stopping": "🛑 正在停止 Antigravity 系统...\n🛑 Stopping Antigravity System...",
+    "terminating_monitor": "⏹️  正在终止监控器...\n⏹️  Terminating Monitor...",
+    "terminating_dashboard": "⏹️  正在终止面板...\n⏹️  Terminating Dashboard...",
+    "force_killing": "⚠️  强制结束进程...\n⚠️  Force killing processes...",
+    "stopped": "✅ 所有服务已停止 / All services stopped.\n👋 再见! / Goodbye!",
+    "wrong_directory": "❌ 错误: 必须从项目根目录运行\n❌ Error: Must run from project root directory\n   当前目录 / Current directory: {cwd}",
+    "missing_config": "⚠️  警告: 未找到 {path}\n⚠️  Warning: {path} not found",
+}
+
+
+def open_monitor_log():
+    """
+    以追加模式打开监控器日志,超过上限时先轮转为 .1
+    Open the monitor log for appending, rotating it to .1 once it exceeds the cap
+    """
+    os.makedirs(os.path.dirname(MONITOR_LOG), exist_ok=True)
+    try:
+        if os.path.getsize(MONITOR_LOG) > MONITOR_LOG_MAX_BYTES:
+            os.replace(MONITOR_LOG, MONITOR_LOG + ".1")
+    except OSError:
+        pass
+    return open(MONITOR_LOG, "ab", buffering=0)
+
+
+class ChildExitWatcher:
+    """
+    子进程退出通知器,空闲时不产生任何周期性唤醒
+    Child-exit notifier with no periodic wakeups while idle
+
+    POSIX 上由 SIGCHLD 唤醒; Windows 没有 SIGCHLD,改为每个子进程一个等待线程
+    Woken by SIGCHLD on POSIX; Windows has no SIGCHLD, so one waiter thread per child
+    """
+
+    def __init__(self):
+        self._use_sigchld = hasattr(signal, "SIGCHLD")
+        if self._use_sigchld:
+            # 信号处理器内获取锁可能死锁,借助 wakeup fd 把信号转成管道字节
+            # Taking locks inside a signal handler can deadlock; let the wakeup fd
+            # turn each signal into a byte on a pipe instead
+            self._wake_r, wake_w = os.pipe()
+            os.set_blocking(wake_w, False)
+            signal.set_wakeup_fd(wake_w)
+            signal.signal(signal.SIGCHLD, lambda signum, frame: None)
+        else:
+            self._exited = threading.Event()
+
+    def track(self, proc):
+        """
+        登记子进程 (仅 Windows 需要)
+        Register a child process (only needed on Windows)
+        """
+        if not self._use_sigchld:
+            threading.Thread(target=self._wait_child, args=(proc,), daemon=True).start()
+        return proc
+
+    def _wait_child(self, proc):
+        proc.wait()
+        self._exited.set()
+
+    def wait(self):
+        """
+        阻塞直到有子进程退出 (或收到其他信号)
+        Block until a child exits (or another signal arrives)
+        """
+        if self._use_sigchld:
+            os.read(self._wake_r, 512)
+        else:
+            # Windows 上无超时的 Event.wait() 无法被 Ctrl+C 打断
+            # An untimed Event.wait() cannot be interrupted by Ctrl+C on Windows
+            while not self._exited.wait(1):
+                pass
+            self._exited.clear()
+
+
+class RestartController:
+    """
+    带完全抖动 (full jitter) 的指数退避重启控制器
+    Restart controller with full-jitter exponential backoff
+
+    连续崩溃时等待 uniform(0, min(cap, base * 2**n)) 秒,稳定运行 stable_window 秒后 n 归零;
+    period 秒内崩溃超过 max_restarts 次则放弃 (Erlang 式重启强度限制)
+    Crash loops wait uniform(0, min(cap, base * 2**n)) seconds, n resets after
+    stable_window seconds of uptime; more than max_restarts crashes within period
+    seconds gives up (Erlang-style restart intensity)
+    """
+
+    def __init__(self, base=1.0, cap=300.0, stable_window=60.0, max_restarts=5, period=60.0):
+        self.base = base
+        self.cap = cap
+        self.stable_window = stable_window
+        self.max_restarts = max_restarts
+        self.period = period
+        self.attempts = 0
+        self.last_start = time.monotonic()
+        self._crashes = deque()
+
+    def started(self):
+        """
+        记录 (重新) 启动时间
+        Record a (re)start
+        """
+        self.last_start = time.monotonic()
+
+    def next_delay(self):
+        """
+        记录一次崩溃,返回重启前应等待的秒数; 超出重启强度时返回 None
+        Record a crash; return seconds to wait before restarting, or None to give up
+        """
+        now = time.monotonic()
+        if now - self.last_start > self.stable_window:
+            self.attempts = 0
+
+        self._crashes.append(now)
+        while now - self._crashes[0] > self.period:
+            self._crashes.popleft()
+        if len(self._crashes) > self.max_restarts:
+            return None
+
+        delay = random.uniform(0, min(self.cap, self.base * 2 ** self.attempts))
+        self.attempts += 1
+        return delay
+
+
+def install_shutdown_handlers():
+    """
+    让 SIGTERM/SIGHUP (POSIX) 与 SIGBREAK (Windows) 走与 Ctrl+C 相同的优雅关闭路径
+    Route SIGTERM/SIGHUP (POSIX) and SIGBREAK (Windows) through the Ctrl+C shutdown path
+
+    systemd/Docker 先发 SIGTERM,若只捕获 KeyboardInterrupt,子进程会成为孤儿并占用端口
+    systemd/Docker send SIGTERM first; catching only KeyboardInterrupt orphans the
+    children and leaves their ports bound
+    """
+    def _shutdown(signum, frame):
+        raise KeyboardInterrupt
+
+    for name in ("SIGTERM", "SIGHUP", "SIGBREAK"):
+        if hasattr(signal, name):
+            signal.signal(getattr(signal, name), _shutdown)
+
+
+def _exited(proc):
+    """
+    子进程是否已退出; asyncio 的 Process 没有 poll(),其 returncode 由事件循环更新
+    Whether the child has exited; asyncio's Process has no poll() and its
+    returncode is kept current by the event loop
+    """
+    poll = getattr(proc, "poll", None)
+    return (poll() if poll is not None else proc.returncode) is not None
+
+
+def terminate_tree(proc):
+    """
+    终止子进程及其进程组 (如 Streamlit 的工作进程)
+    Terminate a child and its process group (e.g. Streamlit's workers)
+    """
+    if _exited(proc):
+        return
+    if os.name == "posix":
+        try:
+            os.killpg(proc.pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+    else:
+        proc.terminate()
+
+
+def kill_tree(proc):
+    """
+    强制结束子进程及其进程组
+    Force-kill a child and its process group
+    """
+    if _exited(proc):
+        return
+    if os.name == "posix":
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+    else:
+        proc.kill()
+
 
 def start_antigravity():
     """
     启动 Antigravity 系统,并行运行监控器和面板
     Start Antigravity system with parallel monitor and dashboard
     """
-    print("🚀 正在启动 Antigravity 系统...")
-    print("🚀 Starting Antigravity System...")
-    print("=" * 60)
+    print(MSG["starting"])
+    
+    # 在启动子进程之前安装,避免漏掉过早退出的子进程
+    # Install before spawning so an early child exit is not missed
+    child_watcher = ChildExitWatcher()
+    install_shutdown_handlers()
     
-    # 获取 Python 解释器路径
-    # Get Python interpreter path
-    python_exe = sys.executable
+    def spawn(cmd, stdout):
+        # 不设置 preexec_fn: start_new_session 仍允许 Linux 上用 vfork() 创建子进程
+        # No preexec_fn: start_new_session still lets CPython vfork() on Linux
+        return child_watcher.track(subprocess.Popen(
+            cmd, stdout=stdout, stderr=subprocess.STDOUT, start_new_session=True
+        ))
     
     # 1. 启动 Monitor Agent (后台进程)
     # 1. Start Monitor Agent (background process)
-    print("📡 正在启动监控代理...")
-    print("📡 Starting Monitor Agent...")
-    monitor_proc = subprocess.Popen(
-        [python_exe, "-m", "antigravity.infrastructure.monitor"],
-        stdout=subprocess.PIPE,
-        stderr=subprocess.STDOUT,
-        text=True,
-        bufsize=1
-    )
-    print("✅ 监控代理已启动 (进程ID: {})".format(monitor_proc.pid))
-    print("✅ Monitor Agent started (PID: {})".format(monitor_proc.pid))
+    print(MSG["starting_monitor"])
+    with open_monitor_log() as monitor_log:
+        monitor_proc = spawn(MONITOR_CMD, monitor_log)
+    # 子进程运行在独立会话中,不会收到终端的 Ctrl+C; 异常退出时由 atexit 兜底清理
+    # Children run in their own session and miss the terminal's Ctrl+C;
+    # atexit is the last-ditch cleanup if we exit abnormally
+    atexit.register(lambda: kill_tree(monitor_proc))
+    print(MSG["monitor_started"].format(pid=monitor_proc.pid))
     
     # 给监控器一点时间初始化
     # Give monitor a moment to initialize
@@ -44,25 +273,12 @@ def start_antigravity():
     
     # 2. 启动 Dashboard (Streamlit)
     # 2. Start Dashboard (Streamlit)
-    print("🌐 正在启动 Web 面板...")
-    print("🌐 Starting Web Dashboard...")
-    dashboard_proc = subprocess.Popen(
-        [python_exe, "-m", "streamlit", "run", 
-         "antigravity/interface/dashboard.py", 
-         "--server.headless", "true",
-         "--server.port", "8501"],
-        stdout=subprocess.DEVNULL,
-        stderr=subprocess.STDOUT
-    )
-    print("✅ Web 面板已启动 (进程ID: {})".format(dashboard_proc.pid))
-    print("✅ Web Dashboard started (PID: {})".format(dashboard_proc.pid))
-    
-    print("=" * 60)
-    print("🎯 Antigravity 正在运行!")
-    print("🎯 Antigravity is now running!")
-    print("📊 面板地址 / Dashboard: http://localhost:8501")
-    print("🛑 按 Ctrl+C 停止所有服务 / Press Ctrl+C to stop all services")
-    print("=" * 60)
+    print(MSG["starting_dashboard"])
+    dashboard_proc = spawn(DASHBOARD_CMD, subprocess.DEVNULL)
+    atexit.register(lambda: kill_tree(dashboard_proc))
+    print(MSG["dashboard_started"].format(pid=dashboard_proc.pid))
+    
+    print(MSG["running"])
     
     # 如果可用,发送桌面通知
     # Send desktop notification if available
@@ -72,92 +288,84 @@ def start_antigravity():
     except Exception:
         pass  # 如果通知器不可用,静默失败 / Silent fail if notifier not available
     
-    # 健康监控循环
-    # Health monitoring loop
+    # 每个子进程独立的重启退避
+    # Independent restart backoff per child
+    monitor_restarts = RestartController()
+    dashboard_restarts = RestartController()
+    
+    # 健康监控循环: 阻塞等待子进程退出事件,而不是定时轮询
+    # Health monitoring loop: block on child-exit events instead of polling
     try:
         while True:
-            time.sleep(2)
+            child_watcher.wait()
             
             # 检查监控器是否意外退出
             # Check if monitor died
             if monitor_proc.poll() is not None:
-                print("❌ 监控进程意外退出 (退出码: {})".format(monitor_proc.returncode))
-                print("❌ Monitor process exited unexpectedly (code: {})".format(monitor_proc.returncode))
-                print("🔄 正在尝试重启监控器...")
-                print("🔄 Attempting to restart monitor...")
-                monitor_proc = subprocess.Popen(
-                    [python_exe, "-m", "antigravity.infrastructure.monitor"],
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.STDOUT,
-                    text=True,
-                    bufsize=1
-                )
-                print("✅ 监控器已重启 (进程ID: {})".format(monitor_proc.pid))
-                print("✅ Monitor restarted (PID: {})".format(monitor_proc.pid))
+                print(MSG["monitor_died"].format(code=monitor_proc.returncode))
+                delay = monitor_restarts.next_delay()
+                if delay is None:
+                    print(MSG["monitor_gave_up"].format(period=monitor_restarts.period))
+                    break
+                print(MSG["monitor_restarting"].format(delay=delay))
+                time.sleep(delay)
+                with open_monitor_log() as monitor_log:
+                    monitor_proc = spawn(MONITOR_CMD, monitor_log)
+                monitor_restarts.started()
+                print(MSG["monitor_restarted"].format(pid=monitor_proc.pid))
             
             # 检查面板是否意外退出
             # Check if dashboard died
             if dashboard_proc.poll() is not None:
-                print("❌ 面板进程意外退出 (退出码: {})".format(dashboard_proc.returncode))
-                print("❌ Dashboard process exited unexpectedly (code: {})".format(dashboard_proc.returncode))
-                print("🔄 正在尝试重启面板...")
-                print("🔄 Attempting to restart dashboard...")
-                dashboard_proc = subprocess.Popen(
-                    [python_exe, "-m", "streamlit", "run", 
-                     "antigravity/interface/dashboard.py", 
-                     "--server.headless", "true",
-                     "--server.port", "8501"],
-                    stdout=subprocess.DEVNULL,
-                    stderr=subprocess.STDOUT
-                )
-                print("✅ 面板已重启 (进程ID: {})".format(dashboard_proc.pid))
-                print("✅ Dashboard restarted (PID: {})".format(dashboard_proc.pid))
+                print(MSG["dashboard_died"].format(code=dashboard_proc.returncode))
+                delay = dashboard_restarts.next_delay()
+                if delay is None:
+                    print(MSG["dashboard_gave_up"].format(period=dashboard_restarts.period))
+                    break
+                print(MSG["dashboard_restarting"].format(delay=delay))
+                time.sleep(delay)
+                dashboard_proc = spawn(DASHBOARD_CMD, subprocess.DEVNULL)
+                dashboard_restarts.started()
+                print(MSG["dashboard_restarted"].format(pid=dashboard_proc.pid))
                 
     except KeyboardInterrupt:
-        print("\n🛑 正在停止 Antigravity 系统...")
-        print("🛑 Stopping Antigravity System...")
-        
-        # 优雅关闭
-        # Graceful shutdown
-        print("⏹️  正在终止监控器...")
-        print("⏹️  Terminating Monitor...")
-        monitor_proc.terminate()
-        
-        print("⏹️  正在终止面板...")
-        print("⏹️  Terminating Dashboard...")
-        dashboard_proc.terminate()
-        
-        # 等待进程终止
-        # Wait for processes to terminate
-        try:
-            monitor_proc.wait(timeout=5)
-            dashboard_proc.wait(timeout=5)
-        except subprocess.TimeoutExpired:
-            print("⚠️  强制结束进程...")
-            print("⚠️  Force killing processes...")
-            monitor_proc.kill()
-            dashboard_proc.kill()
-        
-        print("✅ 所有服务已停止 / All services stopped.")
-        print("👋 再见! / Goodbye!")
+        print()
+    
+    print(MSG["stopping"])
+    
+    # 优雅关闭
+    # Graceful shutdown
+    print(MSG["terminating_monitor"])
+    terminate_tree(monitor_proc)
+    
+    print(MSG["terminating_dashboard"])
+    terminate_tree(dashboard_proc)
+    
+    # 等待进程终止
+    # Wait for processes to terminate
+    try:
+        monitor_proc.wait(timeout=5)
+        dashboard_proc.wait(timeout=5)
+    except subprocess.TimeoutExpired:
+        print(MSG["force_killing"])
+        kill_tree(monitor_proc)
+        kill_tree(dashboard_proc)
+    
+    print(MSG["stopped"])
 
 if __name__ == "__main__":
     # 检查是否在正确的目录
     # Check if we're in the right directory
     if not os.path.exists("antigravity"):
-        print("❌ 错误: 必须从项目根目录运行")
-        print("❌ Error: Must run from project root directory")
-        print("   当前目录 / Current directory: {}".format(os.getcwd()))
+        print(MSG["wrong_directory"].format(cwd=os.getcwd()))
         sys.exit(1)
     
     # 检查必需文件是否存在
     # Check if required files exist
     if not os.path.exists("config/settings.json"):
-        print("⚠️  警告: 未找到 config/settings.json")
-        print("⚠️  Warning: config/settings.json not found")
+        print(MSG["missing_config"].format(path="config/settings.json"))
     
     if not os.path.exists("config/prompts.yaml"):
-        print("⚠️  警告: 未找到 config/prompts.yaml")
-        print("⚠️  Warning: config/prompts.yaml not found")
+        print(MSG["missing_config"].format(path="config/prompts.yaml"))
     
     start_antigravity()
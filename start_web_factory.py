@@ -1,87 +1,237 @@
-import subprocess
-import time
+import asyncio
+import atexit
+import json
+import signal
+import socket
 import sys
 import os
+import webbrowser
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Optional, Tuple
 
-def start_web_factory():
-    print("🛡️ Ignite: Antigravity Web Factory v2.1.15")
-    
-    # 显式设置 PYTHONPATH 环境变量 & Streamlit 配置 (Suppress Welcome Prompt)
-    env_config = os.environ.copy()
-    env_config["PYTHONPATH"] = os.getcwd()
-    env_config["STREAMLIT_SERVER_HEADLESS"] = "true"
-    env_config["STREAMLIT_BROWSER_GATHER_USAGE_STATS"] = "false"
-
-    # Port Selection Logic
-    def find_free_port(start_port):
-        import socket
-        port = start_port
-        while port < start_port + 100:
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
-                res = sock.connect_ex(('localhost', port))
-                if res != 0: # Port is free
-                    return port
-            port += 1
-        raise RuntimeError(f"No free ports found starting from {start_port}")
-
-    dashboard_port = find_free_port(8501)
-    hud_port = find_free_port(dashboard_port + 1)
-
-    # 1. 启动 Monitor (后端引擎)
-    print("   ⚙️ Launching Backend Execution Engine (Monitor)...")
-    monitor_process = subprocess.Popen([sys.executable, "-m", "antigravity.infrastructure.monitor"], env=env_config)
-
-    # 2. 启动 Dashboard
-    print(f"   🚀 Launching Control Dashboard ({dashboard_port})...")
-    dash_process = subprocess.Popen([sys.executable, "-m", "streamlit", "run", "antigravity/interface/dashboard.py", "--server.port", str(dashboard_port)], env=env_config)
-
-    # 3. 启动 HUD
-    print(f"   🔮 Launching Cyberpunk Visual Cortex ({hud_port})...")
-    hud_process = subprocess.Popen([sys.executable, "-m", "streamlit", "run", "antigravity/interface/cyberpunk_hud.py", "--server.port", str(hud_port)], env=env_config)
+from start_all import (
+    MONITOR_CMD, RestartController, install_shutdown_handlers, terminate_tree, kill_tree
+)
 
-    print("\n✅ Antigravity Factory Online (Namespace & Ports Aligned)")
-    
-    # 4. Auto-Open Browser (v2.1.16: Smart Wait)
-    def wait_for_port(port, timeout=15):
-        import socket
-        start_time = time.time()
-        while time.time() - start_time < timeout:
+# 显式设置 PYTHONPATH 环境变量 & Streamlit 配置 (Suppress Welcome Prompt)
+# Built once and frozen: every spawn and restart gets the identical environment
+CWD = os.getcwd()
+ENV = MappingProxyType({
+    **os.environ,
+    "PYTHONPATH": CWD,
+    "STREAMLIT_SERVER_HEADLESS": "true",
+    "STREAMLIT_BROWSER_GATHER_USAGE_STATS": "false",
+})
+
+def load_launcher_settings(path=os.path.join("config", "settings.json")):
+    """Return the "launcher" section of settings.json, or {} if it is missing or unreadable."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f).get("launcher", {})
+    except Exception:
+        return {}
+
+# Opt-in: keep the Streamlit servers off the monitor's CPUs and at a lower priority
+CPU_ISOLATION = bool(load_launcher_settings().get("cpu_isolation", False))
+
+@dataclass
+class Service:
+    """One supervised child of the web factory."""
+    name: str
+    banner: str  # Launch message; may reference {port}
+    cmd: Tuple[str, ...]
+    port: Optional[int] = None  # Preferred port, passed as --server.port
+    restart: bool = False  # Auto-restart (with backoff) when it dies
+    ui: bool = False  # Streamlit front end; yields CPU to the monitor under cpu_isolation
+
+DASHBOARD_CMD = (sys.executable, "-m", "streamlit", "run", "antigravity/interface/dashboard.py")
+HUD_CMD = (sys.executable, "-m", "streamlit", "run", "antigravity/interface/cyberpunk_hud.py")
+
+SERVICES = [
+    Service("Monitor", "⚙️ Launching Backend Execution Engine (Monitor)...", MONITOR_CMD, restart=True),
+    Service("Dashboard", "🚀 Launching Control Dashboard ({port})...", DASHBOARD_CMD, port=8501, ui=True),
+    Service("HUD", "🔮 Launching Cyberpunk Visual Cortex ({port})...", HUD_CMD, port=8502, ui=True),
+]
+
+def pick_port(preferred, taken=()):
+    """Return preferred if it can be bound, else an ephemeral port from the kernel.
+
+    One bind() per attempt instead of probing up to 100 ports with connect_ex,
+    which also missed ports that were bound but not yet listening.
+    """
+    taken = set(taken)
+    candidate = preferred
+    while True:
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            if os.name == "posix":
+                # Ignore TIME_WAIT leftovers, as Streamlit's own server does
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
             try:
-                with socket.create_connection(("localhost", port), timeout=1):
-                    return True
-            except (OSError, ConnectionRefusedError):
-                time.sleep(1)
-        return False
+                sock.bind(('', candidate))
+            except OSError:
+                candidate = 0
+                continue
+            port = sock.getsockname()[1]
+        if port not in taken:
+            return port
+        candidate = 0
+
+async def wait_for_port(port, timeout=15):
+    """Probe until something accepts connections on port (v2.1.16 Smart Wait).
+
+    Starts at 20ms between attempts and backs off to at most 100ms, so a
+    service that comes up quickly is noticed almost immediately.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    attempt = 0
+    while loop.time() < deadline:
+        try:
+            _, writer = await asyncio.open_connection('127.0.0.1', port)
+        except OSError:
+            await asyncio.sleep(min(0.02 * 1.5 ** attempt, 0.1))
+            attempt += 1
+            continue
+        writer.close()
+        return True
+    return False
 
+async def open_browsers(web):
+    """Open each web service in the browser once its port accepts connections."""
     try:
-        import webbrowser
         print("   🌐 Waiting for services to initialize...")
-        
-        # Parallel-ish wait not strictly necessary, sequential is fine for usability
-        if wait_for_port(dashboard_port):
-            print(f"   ✅ Dashboard ready! Opening http://localhost:{dashboard_port}")
-            webbrowser.open(f"http://localhost:{dashboard_port}")
-        else:
-            print(f"   ⚠️ Dashboard ({dashboard_port}) startup timed out.")
-
-        if wait_for_port(hud_port):
-            print(f"   ✅ HUD ready! Opening http://localhost:{hud_port}")
-            webbrowser.open(f"http://localhost:{hud_port}")
-        else:
-            print(f"   ⚠️ HUD ({hud_port}) startup timed out.")
-            
+
+        # Web services boot concurrently, so probe all of them at once
+        ready = await asyncio.gather(*(wait_for_port(port) for _, port in web))
+
+        for (name, port), is_ready in zip(web, ready):
+            if is_ready:
+                print(f"   ✅ {name} ready! Opening http://localhost:{port}")
+                webbrowser.open(f"http://localhost:{port}")
+            else:
+                print(f"   ⚠️ {name} ({port}) startup timed out.")
+
     except Exception as e:
         print(f"⚠️ Browser auto-launch failed: {e}")
 
+def isolate_cpu(pid, ui):
+    """Split the CPUs between the UI servers and the monitor, and renice the UI.
+
+    Linux only, and the split needs at least 4 CPUs; elsewhere this is a no-op.
+    Best effort: called right after spawn, usually before the child has
+    started threads, which then inherit the setting. The affinity only
+    reaches the child's main thread, so any thread already running keeps
+    the full CPU set. Applying it in the child via preexec_fn would rule
+    out vfork() (see spawn).
+    """
+    if hasattr(os, "sched_setaffinity"):
+        cpus = sorted(os.sched_getaffinity(0))
+        if len(cpus) >= 4:
+            half = len(cpus) // 2
+            try:
+                os.sched_setaffinity(pid, cpus[:half] if ui else cpus[half:])
+            except OSError:
+                pass
+    if ui and hasattr(os, "setpriority"):
+        try:
+            os.setpriority(os.PRIO_PROCESS, pid, os.getpriority(os.PRIO_PROCESS, pid) + 5)
+        except OSError:
+            pass
+
+async def spawn(svc, cmd):
+    # Keep preexec_fn unset: start_new_session still lets CPython vfork()
+    # the child on Linux instead of copying our page tables with fork()
+    proc = await asyncio.create_subprocess_exec(*cmd, env=ENV, start_new_session=True)
+    if CPU_ISOLATION:
+        isolate_cpu(proc.pid, svc.ui)
+    return proc
+
+async def supervise(svc, cmd, processes):
+    """Wait on one service and restart it with backoff if it is restartable.
+
+    Returns True when the service crashed too often and the factory should
+    give up; a service without restart simply returns False once it exits.
+    """
+    restarts = RestartController() if svc.restart else None
+    while True:
+        await processes[svc.name].wait()
+        if restarts is None:
+            return False
+        # 抖动指数退避,防止导入即崩溃时的 fork 风暴
+        delay = restarts.next_delay()
+        if delay is None:
+            print(f"💀 FATAL: {svc.name} crashed too often within {restarts.period:.0f}s. Giving up.")
+            return True
+        print(f"⚠️ {svc.name} died. Auto-restarting in {delay:.1f}s...")
+        await asyncio.sleep(delay)
+        processes[svc.name] = await spawn(svc, cmd)
+        restarts.started()
+
+async def run_factory(services):
+    print("🛡️ Ignite: Antigravity Web Factory v2.1.15")
+
+    # Port Selection Logic: preferred port if free, else one the kernel hands out.
+    # Nothing is listening yet, so later services must skip ports already handed out
+    ports = {}
+    for svc in services:
+        if svc.port is not None:
+            ports[svc.name] = pick_port(svc.port, taken=ports.values())
+
+    # Full command lines are fixed once ports are known; restarts reuse them as-is
+    argv = {
+        svc.name: svc.cmd + ("--server.port", str(ports[svc.name])) if svc.name in ports else svc.cmd
+        for svc in services
+    }
+
+    # SIGTERM/SIGHUP cancel this task so shutdown runs inside the loop;
+    # Windows loops have no add_signal_handler, so fall back to KeyboardInterrupt
+    loop = asyncio.get_running_loop()
+    main_task = asyncio.current_task()
     try:
-        while True:
-            time.sleep(2)
-            if monitor_process.poll() is not None:
-                print("⚠️ Monitor engine died. Auto-restarting...")
-                monitor_process = subprocess.Popen([sys.executable, "-m", "antigravity.infrastructure.monitor"], env=env_config)
-    except KeyboardInterrupt:
+        for sig in (signal.SIGTERM, signal.SIGHUP):
+            loop.add_signal_handler(sig, main_task.cancel)
+    except (AttributeError, NotImplementedError):
+        install_shutdown_handlers()
+
+    processes = {}
+    for svc in services:
+        print(f"   {svc.banner.format(port=ports.get(svc.name))}")
+        processes[svc.name] = await spawn(svc, argv[svc.name])
+
+    # 子进程运行在独立会话中; 异常退出时由 atexit 兜底清理
+    atexit.register(lambda: [kill_tree(p) for p in processes.values()])
+
+    print("\n✅ Antigravity Factory Online (Namespace & Ports Aligned)")
+
+    # Auto-Open Browser (v2.1.16: Smart Wait)
+    browsers = asyncio.create_task(open_browsers([(svc.name, ports[svc.name]) for svc in services if svc.name in ports]))
+
+    # 每个服务一个任务,等待子进程退出事件而不是轮询
+    supervisors = {asyncio.create_task(supervise(svc, argv[svc.name], processes)) for svc in services}
+    try:
+        pending = supervisors
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            if any(task.result() for task in done):
+                break
+    finally:
+        browsers.cancel()
+        for task in supervisors:
+            task.cancel()
+
         print("\n🛑 Shutting down Factory...")
-        for p in [monitor_process, dash_process, hud_process]: p.terminate()
+        for p in processes.values(): terminate_tree(p)
+        try:
+            await asyncio.wait_for(asyncio.gather(*(p.wait() for p in processes.values())), timeout=5)
+        except asyncio.TimeoutError:
+            for p in processes.values(): kill_tree(p)
+
+def start_web_factory(services=SERVICES):
+    try:
+        asyncio.run(run_factory(services))
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
 
 if __name__ == "__main__":
     start_web_factory()
@@ -1 +1,15 @@
 # E2E Test Package
+import os
+import sys
+import tempfile
+
+# Work files on tmpfs where available so I/O timing does not depend on the disk;
+# every TemporaryDirectory() in the suite lands here. Only when /dev/shm is
+# writable and roomy: containers often mount a 64 MB one
+_SHM = '/dev/shm'
+_SHM_MIN_FREE = 256 * 1024 * 1024
+
+if sys.platform == 'linux' and os.path.isdir(_SHM) and os.access(_SHM, os.W_OK):
+    _shm_stat = os.statvfs(_SHM)
+    if _shm_stat.f_bavail * _shm_stat.f_frsize >= _SHM_MIN_FREE:
+        tempfile.tempdir = _SHM
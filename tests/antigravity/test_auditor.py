@@ -1,35 +1,44 @@
 import unittest
 import os
+import tempfile
+from pathlib import Path
 from unittest.mock import MagicMock, patch
 from antigravity.core.autonomous_auditor import AutonomousAuditor as Auditor
 
 class TestAuditor(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # PLAN.md and the auditor are read-only across tests: create them once,
+        # in a temp dir instead of the working directory
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        cls.plan_path = os.path.join(cls.temp_dir.name, "PLAN.md")
+        Path(cls.plan_path).write_text("# Plan\nImplement real auth.")
+        cls.auditor = Auditor(cls.temp_dir.name)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.temp_dir.cleanup()
+
     def setUp(self):
-        self.auditor = Auditor(".")
         self.test_file_path = "test_auth_hallucination.py"
-        self.plan_path = "PLAN.md"
-
-        # Create dummy PLAN.md
-        with open(self.plan_path, 'w') as f:
-            f.write("# Plan\nImplement real auth.")
+        # The shared auditor's mutable state: start every test clean
+        self.auditor.current_idea = None
+        self.auditor.execution_log = []
 
     def tearDown(self):
         if os.path.exists(self.test_file_path):
             os.remove(self.test_file_path)
-        if os.path.exists(self.plan_path):
-            os.remove(self.plan_path)
         if os.path.exists("VIBE_FIX.md"):
             os.remove("VIBE_FIX.md")
 
-    @patch('antigravity.auditor.requests.post')
-    @patch('antigravity.utils.get_git_diff')
-    @patch('antigravity.auditor.alert_critical')
+    @patch('requests.post')
+    @patch('antigravity.utils.utils.get_git_diff')
+    @patch('antigravity.infrastructure.notifier.alert_critical')
     def test_hallucination_induction(self, mock_alert, mock_diff, mock_api):
         """Simulate hallucination and verify SYSTEM CRITICAL response."""
         # Setup hallucinated code
         code = "def authenticate(user): return True # TODO: Implement real auth"
-        with open(self.test_file_path, 'w') as f:
-            f.write(code)
+        Path(self.test_file_path).write_text(code)
             
         # Mock diff
         mock_diff.return_value = "+ def authenticate(user): return True"
@@ -48,15 +57,13 @@ class TestAuditor(unittest.TestCase):
         
         # Check VIBE_FIX.md
         self.assertTrue(os.path.exists("VIBE_FIX.md"))
-        with open("VIBE_FIX.md", 'r') as f:
-            self.assertIn("[SYSTEM CRITICAL]", f.read())
+        self.assertIn("[SYSTEM CRITICAL]", Path("VIBE_FIX.md").read_text())
             
         # Check Injection
-        with open(self.test_file_path, 'r') as f:
-            first_line = f.readline()
-            self.assertIn("# FIXME: DeepSeek Auditor", first_line)
+        first_line = Path(self.test_file_path).read_text().partition("\n")[0]
+        self.assertIn("# FIXME: DeepSeek Auditor", first_line)
 
-    @patch('antigravity.auditor.alert_critical')
+    @patch('antigravity.infrastructure.notifier.alert_critical')
     def test_circuit_breaker(self, mock_alert):
         """Verify manual mode after 3 failures."""
         self.auditor.failure_counts[self.test_file_path] = 3
@@ -1,54 +1,143 @@
+import sys
+import tempfile
+import threading
 import time
-import os
 import unittest
-from unittest.mock import MagicMock, patch
-from antigravity.monitor import AntigravityMonitor
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest.mock import MagicMock
 
+# Add project root to sys.path
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+try:
+    from antigravity.infrastructure.monitor import AntigravityMonitor
+except ImportError:  # watchdog not installed
+    AntigravityMonitor = None
+
+
+def make_event(path):
+    event = MagicMock()
+    event.is_directory = False
+    event.src_path = path
+    return event
+
+
+@unittest.skipIf(AntigravityMonitor is None, "watchdog not installed")
 class TestMonitor(unittest.TestCase):
     def setUp(self):
-        self.monitor = AntigravityMonitor(".")
+        self.tmp = tempfile.TemporaryDirectory()
+        self.monitor = AntigravityMonitor(self.tmp.name)
         self.monitor.auditor = MagicMock()
         self.monitor.debounce_seconds = 0.5 # Shorten for test
+        # Virtual clock: tests advance time and flush instead of sleeping
+        self.now = 0.0
+        self.monitor._now = lambda: self.now
+
+    def tearDown(self):
+        self.monitor.stop()
+        self.tmp.cleanup()
 
     def test_debouncing(self):
         """Monitor should debounce rapid events."""
-        event = MagicMock()
-        event.is_directory = False
-        event.src_path = "test_file.py"
-        
         # Simulate rapid firing
-        self.monitor.on_modified(event)
-        self.monitor.on_modified(event)
-        self.monitor.on_modified(event)
-        
+        self.monitor.on_modified(make_event("test_file.py"))
+        self.monitor.on_modified(make_event("test_file.py"))
+        self.monitor.on_modified(make_event("test_file.py"))
+
         # Should not be called yet
-        self.monitor.auditor.audit_file.assert_not_called()
-        
-        # Wait for debounce
-        time.sleep(0.6)
-        
+        self.monitor.auditor.audit_and_fix.assert_not_called()
+
+        # Still inside the debounce window
+        self.assertEqual(self.monitor.flush_due(now=0.4), [])
+        self.monitor.auditor.audit_and_fix.assert_not_called()
+
+        # Debounce window closes
+        self.assertEqual(self.monitor.flush_due(now=0.6), ["test_file.py"])
+
         # Should be called ONCE
-        self.monitor.auditor.audit_file.assert_called_once_with("test_file.py")
+        self.monitor.auditor.audit_and_fix.assert_called_once_with("test_file.py")
+        self.assertEqual(self.monitor.pending, {})
 
     def test_loop_prevention(self):
-        """Monitor should ignore files with FIXME signature."""
-        filename = "test_loop.py"
-        with open(filename, "w") as f:
-            f.write("# FIXME: DeepSeek Auditor identified a logic error.\ndef foo(): pass")
-            
-        try:
-            event = MagicMock()
-            event.is_directory = False
-            event.src_path = filename
-            
-            self.monitor.on_modified(event)
-            time.sleep(0.6) # Wait for debounce just in case
-            
-            # Should NOT be audited because of signature
-            self.monitor.auditor.audit_file.assert_not_called()
-        finally:
-            if os.path.exists(filename):
-                os.remove(filename)
+        """Monitor should ignore its own writes to a file it is taking over."""
+        def audit_and_fix(path, error_context=None):
+            # The auditor rewriting the file fires another event
+            self.monitor.on_modified(make_event(path))
+            return 'PASS'
+        self.monitor.auditor.audit_and_fix.side_effect = audit_and_fix
+
+        self.monitor.on_modified(make_event("test_loop.py"))
+        self.monitor.flush_due(now=0.6)
+
+        self.monitor.auditor.audit_and_fix.assert_called_once_with("test_loop.py")
+        self.assertEqual(self.monitor.pending, {})
+
+    def test_debounce_thread_runs_takeovers_on_pool(self):
+        """Without flush_due, the debounce thread hands due files to the pool."""
+        self.monitor._now = time.monotonic
+        self.monitor.debounce_seconds = 0.05
+        done = threading.Event()
+        seen = []
+
+        def audit_and_fix(path, error_context=None):
+            seen.append((path, threading.current_thread().name))
+            if len(seen) == 2:
+                done.set()
+            return 'PASS'
+        self.monitor.auditor.audit_and_fix.side_effect = audit_and_fix
+
+        for path in ("a.py", "b.py", "a.py"):
+            self.monitor.on_modified(make_event(path))
+
+        self.assertTrue(done.wait(5))
+        self.monitor._takeover_pool.shutdown(wait=True)
+        self.assertEqual(sorted(p for p, _ in seen), ["a.py", "b.py"])
+        self.assertTrue(all(name.startswith('monitor-takeover') for _, name in seen))
+
+    def test_queued_file_is_not_taken_over_twice(self):
+        """A file waiting for a pool worker ignores new events."""
+        self.monitor._now = time.monotonic
+        self.monitor.debounce_seconds = 0.01
+        self.monitor._takeover_pool = ThreadPoolExecutor(max_workers=1)
+        release = threading.Event()
+        started = {name: threading.Event() for name in ("a.py", "b.py")}
+        runs = []
+
+        def audit_and_fix(path, error_context=None):
+            runs.append(path)
+            started[path].set()
+            if path == "a.py":
+                release.wait(5)
+            return 'PASS'
+        self.monitor.auditor.audit_and_fix.side_effect = audit_and_fix
+
+        self.monitor.on_modified(make_event("a.py"))
+        self.assertTrue(started["a.py"].wait(5))
+        # b.py is handed to the pool but waits behind a.py
+        self.monitor.on_modified(make_event("b.py"))
+        deadline = time.monotonic() + 5
+        while "b.py" not in self.monitor._queued_files and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.monitor.on_modified(make_event("b.py"))
+        self.assertEqual(self.monitor.pending, {})
+
+        release.set()
+        self.assertTrue(started["b.py"].wait(5))
+        self.monitor._takeover_pool.shutdown(wait=True)
+        self.assertEqual(runs, ["a.py", "b.py"])
+
+    def test_stop_ends_debounce_thread(self):
+        self.monitor.on_modified(make_event("a.py"))
+        thread = self.monitor._debounce_thread
+        self.monitor.stop()
+        thread.join(5)
+        self.assertFalse(thread.is_alive())
+
+        # Later events are dropped
+        self.monitor.on_modified(make_event("b.py"))
+        self.assertEqual(self.monitor.pending, {})
+        self.monitor.auditor.audit_and_fix.assert_not_called()
 
 if __name__ == '__main__':
     unittest.main()
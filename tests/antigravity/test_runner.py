@@ -1,7 +1,14 @@
+import subprocess
+import sys
 import unittest
+from pathlib import Path
 from unittest.mock import MagicMock, patch
-from antigravity.utils import get_related_test
-from antigravity.test_runner import auto_rollback
+
+# Add project root to sys.path
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from antigravity.utils.utils import get_related_test
+from antigravity.infrastructure.test_runner import auto_rollback, _GIT
 
 class TestRunner(unittest.TestCase):
     def test_test_mapping(self):
@@ -9,12 +16,23 @@ class TestRunner(unittest.TestCase):
         self.assertEqual(get_related_test("src/auth.py"), "tests/test_auth.py")
         self.assertEqual(get_related_test("src/core/login.py"), "tests/core/test_login.py") # Note: utils implementation simple mapping might need adjustment if structure is complex, but for demo it just prefixes tests/
 
+    def test_test_mapping_is_cached(self):
+        """Repeated saves of one file reuse the cached mapping."""
+        get_related_test.cache_clear()
+        self.assertEqual(get_related_test("src\\auth.py"), "tests/test_auth.py")
+        self.assertEqual(get_related_test("src\\auth.py"), "tests/test_auth.py")
+        self.assertEqual(get_related_test("tests/test_auth.py"), "tests/test_auth.py")
+        info = get_related_test.cache_info()
+        self.assertEqual((info.hits, info.misses), (1, 2))
+
     @patch('subprocess.run')
-    @patch('antigravity.test_runner.alert_critical')
+    @patch('antigravity.infrastructure.test_runner.alert_critical')
     def test_auto_rollback(self, mock_alert, mock_run):
         """Verify git stash command."""
         auto_rollback()
-        mock_run.assert_called_with(["git", "stash", "save", "Antigravity broken attempt"], check=True)
+        mock_alert.assert_called_once()
+        mock_run.assert_called_with([_GIT, "stash", "save", "Antigravity broken attempt"], check=True,
+                                    close_fds=False, stdin=subprocess.DEVNULL)
 
 if __name__ == '__main__':
     unittest.main()
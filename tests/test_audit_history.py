@@ -0,0 +1,147 @@
+
+import unittest
+import tempfile
+import json
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import patch
+
+# Add project root to sys.path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from antigravity.infrastructure import audit_history
+from antigravity.infrastructure.audit_history import AuditHistoryManager
+from antigravity.infrastructure.delivery_gate import DeliveryResult, LocalSignature
+
+
+def make_result(can_deliver=True, vibe_score=95.0):
+    local = LocalSignature(
+        signed=can_deliver, vibe_score=vibe_score, syntax_errors=0, import_errors=0,
+        constraint_violations=0, security_issues=0, timestamp=datetime(2024, 1, 1), signature="sig"
+    )
+    return DeliveryResult(
+        can_deliver=can_deliver,
+        local_signature=local,
+        remote_signature=None,
+        blocking_issues=[] if can_deliver else ["low vibe"],
+        quality_report={'vibe_score': vibe_score, 'test_coverage': 80, 'logic_score': 90, 'security_issues': 1},
+        audit_tier_results={'tier1': 'pass'}
+    )
+
+
+class TestAuditHistoryManager(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.manager = AuditHistoryManager(Path(self.temp_dir.name))
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_save_and_load(self):
+        self.manager.save_audit(make_result(True, 95.0), "proj")
+        self.manager.save_audit(make_result(False, 70.0), "proj")
+
+        history = self.manager.get_history("proj")
+        self.assertEqual([r['vibe_score'] for r in history], [70.0, 95.0])
+        self.assertEqual(len(history[0]['checksum']), 16)
+        self.assertTrue(history[1]['local_signed'])
+
+    def test_max_history_limit(self):
+        for i in range(AuditHistoryManager.MAX_HISTORY + 5):
+            self.manager.save_audit(make_result(True, float(i)), "proj")
+
+        history = self.manager.get_history("proj", limit=100)
+        self.assertEqual(len(history), AuditHistoryManager.MAX_HISTORY)
+        self.assertEqual(history[0]['vibe_score'], float(AuditHistoryManager.MAX_HISTORY + 4))
+
+    def test_save_audits_matches_repeated_save_audit(self):
+        results = [make_result(True, float(i)) for i in range(AuditHistoryManager.MAX_HISTORY + 5)]
+        with patch.object(AuditHistoryManager, '_write_history', wraps=self.manager._write_history) as write:
+            self.manager.save_audits(results, "bulk")
+        self.assertEqual(write.call_count, 1)
+
+        for result in results:
+            self.manager.save_audit(result, "single")
+
+        def scores(project):
+            return [r['vibe_score'] for r in self.manager.get_history(project, limit=100)]
+        self.assertEqual(scores("bulk"), scores("single"))
+        self.assertEqual(scores("bulk")[0], float(AuditHistoryManager.MAX_HISTORY + 4))
+
+        self.manager.save_audits([], "empty")
+        self.assertEqual(self.manager.get_history("empty"), [])
+
+    def test_tampered_record_is_dropped(self):
+        with patch.object(audit_history, 'msgpack', None):
+            self.manager.save_audit(make_result(True, 95.0), "proj")
+            history_file = self.manager.history_dir / "proj_history.json"
+            records = json.loads(history_file.read_text(encoding='utf-8'))
+            records[0]['vibe_score'] = 100.0
+            history_file.write_text(json.dumps(records), encoding='utf-8')
+
+            self.assertEqual(self.manager.get_history("proj"), [])
+
+    def test_json_fallback_without_msgpack(self):
+        with patch.object(audit_history, 'msgpack', None):
+            self.manager.save_audit(make_result(True, 95.0), "proj")
+            self.assertTrue((self.manager.history_dir / "proj_history.json").exists())
+            self.assertEqual(self.manager.get_latest_result("proj")['vibe_score'], 95.0)
+
+    @unittest.skipIf(audit_history.msgpack is None, "msgpack not installed")
+    def test_legacy_json_migrates_to_msgpack(self):
+        with patch.object(audit_history, 'msgpack', None):
+            self.manager.save_audit(make_result(True, 90.0), "proj")
+
+        self.manager.save_audit(make_result(True, 95.0), "proj")
+
+        self.assertFalse((self.manager.history_dir / "proj_history.json").exists())
+        self.assertTrue((self.manager.history_dir / "proj_history.mpk").exists())
+        self.assertEqual([r['vibe_score'] for r in self.manager.get_history("proj")], [95.0, 90.0])
+
+    @unittest.skipIf(audit_history.msgpack is None, "msgpack not installed")
+    def test_newer_json_wins_over_stale_msgpack(self):
+        self.manager.save_audit(make_result(True, 90.0), "proj")
+        os.utime(self.manager.history_dir / "proj_history.mpk", ns=(0, 0))
+        # Written later in an environment without msgpack
+        with patch.object(audit_history, 'msgpack', None):
+            self.manager.save_audit(make_result(True, 95.0), "proj")
+
+        self.assertEqual(self.manager.get_latest_result("proj")['vibe_score'], 95.0)
+
+    def test_unchanged_history_is_not_decoded_again(self):
+        self.manager.save_audit(make_result(True, 95.0), "proj")
+        fresh = AuditHistoryManager(self.manager.project_root)
+
+        with patch.object(AuditHistoryManager, '_decode', wraps=AuditHistoryManager._decode) as decode:
+            fresh.get_history("proj")
+            fresh.get_sparkline_data("proj")
+            fresh.get_latest_result("proj")
+        self.assertEqual(decode.call_count, 1)
+
+        # Another writer replaces the file: the change is picked up
+        self.manager.save_audit(make_result(True, 80.0), "proj")
+        self.assertEqual(fresh.get_latest_result("proj")['vibe_score'], 80.0)
+
+    def test_directory_stats(self):
+        self.manager.save_audit(make_result(), "alpha")
+        self.manager.save_audit(make_result(), "beta")
+
+        stats = self.manager.get_directory_stats()
+        self.assertEqual(stats['total_files'], 2)
+        self.assertGreater(stats['total_size_mb'], 0)
+
+    def test_size_limit_removes_oldest_files(self):
+        self.manager.save_audit(make_result(), "old")
+        old_file = self.manager._history_files()[0].path
+        os.utime(old_file, (0, 0))
+
+        with patch.object(AuditHistoryManager, 'MAX_DIR_SIZE_MB', 1e-9), patch('builtins.print'):
+            self.manager.save_audit(make_result(), "new")
+
+        self.assertFalse(os.path.exists(old_file))
+
+
+if __name__ == '__main__':
+    unittest.main()
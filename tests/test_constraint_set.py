@@ -0,0 +1,32 @@
+
+import unittest
+import sys
+from pathlib import Path
+
+# Add project root to sys.path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from antigravity.core.local_reasoning import ConstraintSet
+
+
+class TestConstraintSet(unittest.TestCase):
+    def setUp(self):
+        self.constraints = ConstraintSet()
+
+    def test_long_function_and_file(self):
+        self.constraints.max_file_lines = 60
+        code = "def very_long_function():\n" + "\n".join("    pass" for _ in range(60))
+
+        violations = self.constraints.validate_code(code, "test.py")
+
+        self.assertIn("Function 'very_long_function' has 61 lines (max: 50)", violations)
+        self.assertIn("File has 61 lines (max: 60)", violations)
+
+    def test_plan_filenames(self):
+        violations = self.constraints.validate_plan({'files_to_create': ['app/models.py', 'app/BadName.py']})
+
+        self.assertEqual(violations, ["Invalid Python filename: app/BadName.py"])
+
+
+if __name__ == '__main__':
+    unittest.main()
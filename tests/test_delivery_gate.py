@@ -0,0 +1,148 @@
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from antigravity.infrastructure.delivery_gate import DeliveryGate
+
+
+class TestDeliveryGateStaticAudit(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+        (self.root / "app.py").write_text(
+            'API_KEY = "sk-1234567890abcdef"\n'
+            'def run():\n'
+            '    return eval("1 + 1")\n',
+            encoding='utf-8'
+        )
+        (self.root / "broken.py").write_text("def oops(:\n", encoding='utf-8')
+        (self.root / "test_app.py").write_text("def test_run(:\n", encoding='utf-8')
+        self.gate = DeliveryGate(self.root)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_delivery_gate_static_audit(self):
+        metrics = self.gate._audit_static_baseline({})['metrics']
+
+        # test_ files are excluded from the syntax and vibe checks
+        self.assertEqual(metrics['syntax_errors'], 1)
+        self.assertEqual(metrics['vibe_score'], 100 - 2 - 20)
+        self.assertEqual(sorted(self.gate._check_security_baseline({})), [
+            'Potential hardcoded secret in app.py: API_KEY',
+            'Unsafe function call in app.py: eval()',
+        ])
+
+    def test_undecodable_file_is_a_syntax_error(self):
+        (self.root / "latin.py").write_bytes(b'x = "\xe9"\n')
+        (self.root / "empty.py").write_bytes(b'')
+
+        self.assertEqual(self.gate._audit_static_baseline({})['metrics']['syntax_errors'], 2)
+
+    def test_modified_file_is_rescanned(self):
+        self.gate._audit_static_baseline({})
+        broken = self.root / "broken.py"
+        broken.write_text('def oops():\n    """Fixed."""\n', encoding='utf-8')
+        # Make sure the stat key changes even on coarse-mtime filesystems
+        st = broken.stat()
+        os.utime(broken, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+        self.assertEqual(self.gate._audit_static_baseline({})['metrics']['syntax_errors'], 0)
+
+    def test_parallel_scan_matches_serial(self):
+        serial = self.gate._audit_static_baseline({})
+        parallel_gate = DeliveryGate(self.root)
+        parallel_gate.PARALLEL_SCAN_THRESHOLD = 1
+        self.assertEqual(parallel_gate._audit_static_baseline({}), serial)
+
+
+class TestDeliveryGateMerkleRoot(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+        for name in ("a.py", "pkg/b.py", "pkg/__pycache__/b.py"):
+            path = self.root / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(f"# {name}\n", encoding='utf-8')
+        self.gate = DeliveryGate(self.root)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_root_is_stable_and_tracks_changes(self):
+        root = self.gate._calculate_merkle_root()
+        self.assertEqual(self.gate._calculate_merkle_root(), root)
+        self.assertEqual(DeliveryGate(self.root)._calculate_merkle_root(), root)
+        self.assertEqual(self.gate._calculate_merkle_root(force_refresh=True), root)
+
+        # __pycache__ is not part of the tree
+        (self.root / "pkg" / "__pycache__" / "b.py").write_text("changed", encoding='utf-8')
+        self.assertEqual(self.gate._calculate_merkle_root(), root)
+
+        (self.root / "pkg" / "b.py").write_text("# changed\n", encoding='utf-8')
+        self.assertNotEqual(self.gate._calculate_merkle_root(), root)
+
+    def test_cache_only_keeps_current_files(self):
+        self.gate._calculate_merkle_root()
+        (self.root / "a.py").unlink()
+        self.gate._calculate_merkle_root()
+
+        cache = json.loads((self.root / '.antigravity_hash_cache.json').read_text(encoding='utf-8'))
+        self.assertEqual([key.split('|')[0] for key in cache], [str(self.root / "pkg" / "b.py")])
+
+    def test_leaf_hash_matches_sha256(self):
+        from antigravity.infrastructure import delivery_gate
+        big = self.root / "big.py"
+        big.write_bytes(b"x = 1\n" * (delivery_gate.MMAP_HASH_THRESHOLD // 6 + 1))
+        for path in (self.root / "a.py", big, self.root / "empty.py"):
+            path.touch()
+            with self.subTest(path=path.name):
+                digest, key = delivery_gate._hash_file(str(path))
+                self.assertEqual(digest, hashlib.sha256(path.read_bytes()).hexdigest())
+                self.assertTrue(key.endswith(f"|{path.stat().st_size}"))
+
+    def test_parallel_hashing_matches_serial(self):
+        serial = self.gate._calculate_merkle_root(force_refresh=True)
+        parallel_gate = DeliveryGate(self.root)
+        parallel_gate.PARALLEL_HASH_THRESHOLD = 1
+        self.assertEqual(parallel_gate._calculate_merkle_root(force_refresh=True, max_workers=2), serial)
+
+    def test_update_leaf_matches_full_recompute(self):
+        self.gate._calculate_merkle_root()
+        target = self.root / "pkg" / "b.py"
+
+        with open(target, 'a', encoding='utf-8') as f:
+            f.write("# tampered\n")
+        self.assertEqual(self.gate.update_leaf(target), DeliveryGate(self.root)._calculate_merkle_root())
+
+        # Relative paths, new files and deleted files
+        (self.root / "c.py").write_text("# new\n", encoding='utf-8')
+        self.assertEqual(self.gate.update_leaf("c.py"), DeliveryGate(self.root)._calculate_merkle_root())
+        target.unlink()
+        self.assertEqual(self.gate.update_leaf(target), DeliveryGate(self.root)._calculate_merkle_root())
+        self.assertEqual(self.gate._calculate_merkle_root(), self.gate.update_leaf("c.py"))
+
+    def test_update_leaf_normalizes_paths(self):
+        # A relative root and differently spelled paths still name one leaf each
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(self.root)
+        gate = DeliveryGate('.')
+        gate._calculate_merkle_root()
+
+        target = self.root / "pkg" / "b.py"
+        target.write_text("# changed\n", encoding='utf-8')
+        for path in (str(target), "./pkg/b.py", "pkg/../pkg/b.py"):
+            with self.subTest(path=path):
+                self.assertEqual(gate.update_leaf(path), DeliveryGate(self.root)._calculate_merkle_root())
+                self.assertEqual(len(gate._merkle_leaves), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
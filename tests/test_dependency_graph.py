@@ -0,0 +1,55 @@
+
+import unittest
+import sys
+from pathlib import Path
+
+# Add project root to sys.path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from antigravity.core.mission_orchestrator import AtomicTask, DependencyGraph, MissionOrchestrator
+
+
+def make_task(task_id, *dependencies):
+    return AtomicTask(task_id=task_id, type='code', goal=task_id, dependencies=list(dependencies))
+
+
+class TestDependencyGraph(unittest.TestCase):
+    def setUp(self):
+        self.graph = DependencyGraph.from_tasks([
+            make_task('api', 'schema'),
+            make_task('schema'),
+            make_task('ui', 'api', 'auth', 'api'),
+        ])
+
+    def test_counts(self):
+        # 'auth' has no task of its own but is still a node; the repeated edge counts once
+        self.assertEqual(self.graph.number_of_nodes(), 4)
+        self.assertEqual(self.graph.number_of_edges(), 3)
+        # node_names is the inverse of node_ids
+        self.assertEqual({name: i for i, name in enumerate(self.graph.node_names)}, self.graph.node_ids)
+
+    def test_neighbours(self):
+        self.assertEqual(self.graph.successors('schema'), ['api'])
+        self.assertEqual(sorted(self.graph.predecessors('ui')), ['api', 'auth'])
+        self.assertEqual(self.graph.predecessors('schema'), [])
+
+    def test_topological_order(self):
+        order = self.graph.topological_order()
+        self.assertEqual(sorted(order), ['api', 'auth', 'schema', 'ui'])
+        self.assertLess(order.index('schema'), order.index('api'))
+        self.assertLess(order.index('api'), order.index('ui'))
+
+        cycle = DependencyGraph.from_tasks([make_task('a', 'b'), make_task('b', 'a')])
+        with self.assertRaises(ValueError):
+            cycle.topological_order()
+
+    def test_orchestrator_builds_graph(self):
+        orchestrator = MissionOrchestrator(project_root=None)
+        self.assertEqual(orchestrator.graph.number_of_nodes(), 0)
+        orchestrator.tasks = [make_task('schema'), make_task('api', 'schema')]
+        orchestrator.build_dependency_graph()
+        self.assertEqual(orchestrator.graph.number_of_edges(), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
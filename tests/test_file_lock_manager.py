@@ -0,0 +1,144 @@
+import asyncio
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from antigravity.infrastructure import file_lock_manager
+from antigravity.infrastructure.file_lock_manager import FileLockManager, _FastLock
+
+
+class TestFileLockManager(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_concurrent_file_access(self):
+        """Concurrent appends under the lock lose no updates"""
+        manager = FileLockManager()
+        test_file = self.root / "counter.txt"
+        test_file.write_text("", encoding="utf-8")
+
+        async def concurrent_write(i):
+            # Simulated work and the line itself are prepared outside the lock;
+            # only the append is the critical section
+            await asyncio.sleep(0.01)
+            line = f"{i}\n"
+            async with manager.lock_file(str(test_file)):
+                with open(test_file, "a", encoding="utf-8") as f:
+                    f.write(line)
+
+        async def run():
+            if sys.version_info >= (3, 11):
+                async with asyncio.TaskGroup() as tg:
+                    for i in range(10):
+                        tg.create_task(concurrent_write(i))
+            else:
+                await asyncio.gather(*(concurrent_write(i) for i in range(10)))
+
+        asyncio.run(run())
+
+        lines = test_file.read_text(encoding="utf-8").splitlines()
+        self.assertEqual(sorted(lines), [str(i) for i in range(10)])
+        self.assertEqual(manager.get_lock_stats()[str(test_file.resolve())], 10)
+
+    def test_file_lock_lru_cache(self):
+        """Idle locks beyond max_locks are evicted oldest first"""
+        manager = FileLockManager(max_locks=10)
+
+        async def run():
+            for i in range(11):
+                async with manager.lock_file(str(self.root / f"file_{i}.txt")):
+                    pass
+
+        asyncio.run(run())
+
+        stats = manager.get_cache_stats()
+        self.assertEqual(stats['total_locks'], 10)
+        self.assertEqual(stats['active_locks'], 0)
+        self.assertNotIn(str((self.root / "file_0.txt").resolve()), manager._locks)
+
+    def test_held_lock_is_not_evicted(self):
+        """A lock that is held survives eviction, so its key keeps one lock"""
+        manager = FileLockManager(max_locks=1)
+        held = str(self.root / "held.txt")
+
+        async def run():
+            async with manager.lock_file(held):
+                async with manager.lock_file(str(self.root / "other.txt")):
+                    self.assertIn(str(Path(held).resolve()), manager._locks)
+            self.assertEqual(len(manager._locks), 1)
+
+        asyncio.run(run())
+
+    def test_evicted_locks_are_reused(self):
+        """New keys rent evicted locks from the pool instead of allocating"""
+        manager = FileLockManager(max_locks=1)
+
+        async def run():
+            async with manager.lock_file(str(self.root / "a.txt")):
+                pass
+            first = next(iter(manager._locks.values()))
+            async with manager.lock_file(str(self.root / "b.txt")):
+                pass
+            self.assertIs(next(iter(manager._locks.values())), first)
+
+        asyncio.run(run())
+
+    def test_lock_timeout(self):
+        """A contended acquire with a timeout raises and is recorded"""
+        manager = FileLockManager()
+        path = str(self.root / "busy.txt")
+
+        async def run():
+            async with manager.lock_file(path, timeout=1.0):
+                with self.assertRaises(asyncio.TimeoutError):
+                    async with manager.lock_file(path, timeout=0.01):
+                        pass
+            # Free again: the next timed acquire takes the fast path
+            async with manager.lock_file(path, timeout=0.01):
+                pass
+
+        asyncio.run(run())
+
+        self.assertEqual(len(manager.get_timeout_events()), 1)
+        self.assertEqual(manager.get_lock_stats()[str(Path(path).resolve())], 2)
+
+
+    def test_fast_path_internals_still_exist(self):
+        """Fails loudly if asyncio.Lock stops keeping its waiter queue in _waiters"""
+        self.assertTrue(file_lock_manager._LOCK_HAS_WAITERS)
+
+    def test_fast_path_respects_queued_waiters(self):
+        """A free lock with a queued waiter is not taken ahead of it"""
+        async def run():
+            lock = _FastLock()
+            self.assertTrue(lock._can_acquire_now())
+            await lock.acquire()
+            waiter = asyncio.ensure_future(lock.acquire())
+            await asyncio.sleep(0)
+            lock.release()
+            # Released, but the waiter has not run yet: it goes first
+            self.assertFalse(lock.locked())
+            self.assertFalse(lock._can_acquire_now())
+            await waiter
+            lock.release()
+
+        asyncio.run(run())
+
+    def test_without_waiter_internals_every_acquire_awaits(self):
+        """The fallback path still serializes and times out correctly"""
+        with patch.object(file_lock_manager, '_LOCK_HAS_WAITERS', False):
+            self.assertFalse(_FastLock()._can_acquire_now())
+            self.test_concurrent_file_access()
+            self.test_lock_timeout()
+
+if __name__ == '__main__':
+    unittest.main()
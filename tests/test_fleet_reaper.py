@@ -0,0 +1,56 @@
+
+import unittest
+import tempfile
+import os
+import sys
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+# Add project root to sys.path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from antigravity.core.fleet_manager import ProjectFleetManager
+
+
+class TestZombieReaper(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.fleet_root = Path(self.temp_dir.name)
+        self.fleet = ProjectFleetManager(fleet_root=self.fleet_root)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def make_project(self, name, beat_age=None):
+        marker = self.fleet_root / name / ".antigravity"
+        marker.mkdir(parents=True)
+        if beat_age is not None:
+            beat = marker / "HEARTBEAT"
+            beat.touch()
+            stamp = time.time() - beat_age
+            os.utime(beat, (stamp, stamp))
+
+    def test_stale_heartbeat_is_quarantined(self):
+        self.make_project("alive", beat_age=60)
+        self.make_project("legacy")
+        self.make_project("zombie", beat_age=7200)
+        (self.fleet_root / "not_a_project").mkdir()
+
+        with patch('builtins.print'):
+            found = self.fleet.scan_fleet()
+
+        self.assertEqual(sorted(found), ["alive", "legacy"])
+        self.assertFalse((self.fleet_root / "zombie").exists())
+        self.assertTrue((self.fleet_root / ".quarantine" / "zombie_ZOMBIE").is_dir())
+
+    def test_vitality_uses_given_clock(self):
+        self.make_project("alive", beat_age=60)
+        project = self.fleet_root / "alive"
+
+        self.assertTrue(self.fleet._check_vitality(project))
+        self.assertFalse(self.fleet._check_vitality(project, now=time.time() + 7200))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+
+import unittest
+import asyncio
+import tempfile
+import json
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+# Add project root to sys.path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from antigravity.services.healing_executor import HealingExecutor
+
+
+class TestHealingExecutor(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+        src = self.root / "src"
+        src.mkdir()
+        (src / "app.py").write_text(
+            'def run():\n    temp_value = eval("1")\n    return temp_value\n', encoding='utf-8'
+        )
+        (src / "config.py").write_text('API_KEY = "abc123"\n', encoding='utf-8')
+        (src / "worker.py").write_text(
+            '"""Worker."""\nimport threading\nx = threading.Thread\n', encoding='utf-8'
+        )
+        (src / "test_app.py").write_text('def test_run():\n    pass\n', encoding='utf-8')
+        cache = src / "__pycache__"
+        cache.mkdir()
+        (cache / "stale.py").write_text('def f():\n    eval("1")\n', encoding='utf-8')
+        self.executor = HealingExecutor(self.root)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_analyze_uncovered_code(self):
+        (self.root / "coverage.json").write_text(json.dumps({'files': {
+            'src/app.py': {'summary': {'percent_covered': 40}},
+            'src/config.py': {'summary': {'percent_covered': 95}},
+        }}), encoding='utf-8')
+
+        uncovered = asyncio.run(self.executor._analyze_uncovered_code())
+        self.assertEqual(uncovered, [Path('src/app.py')])
+
+    def test_coverage_report_parsed_once_per_version(self):
+        coverage = self.root / "coverage.json"
+        coverage.write_text(json.dumps({'files': {
+            'src/app.py': {'summary': {'percent_covered': 40}},
+        }}), encoding='utf-8')
+
+        with patch('antigravity.services.healing_executor.json.loads', wraps=json.loads) as loads:
+            first = asyncio.run(self.executor._analyze_uncovered_code())
+            second = asyncio.run(self.executor._analyze_uncovered_code())
+            self.assertEqual(loads.call_count, 1)
+            self.assertEqual(first, second)
+
+            coverage.write_text(json.dumps({'files': {}}), encoding='utf-8')
+            self.assertEqual(asyncio.run(self.executor._analyze_uncovered_code()), [])
+            self.assertEqual(loads.call_count, 2)
+
+    def test_analyze_quality_issues(self):
+        issues = asyncio.run(self.executor._analyze_quality_issues())
+        names = {path.name: found for path, found in issues.items()}
+        self.assertEqual(names, {'app.py': ['missing_docstring', 'unused_variable']})
+
+    def test_analyze_security_issues(self):
+        issues = asyncio.run(self.executor._analyze_security_issues())
+        names = {path.name: found for path, found in issues.items()}
+        self.assertEqual(names, {
+            'app.py': [('unsafe_function', 'eval/exec')],
+            'config.py': [('hardcoded_secret', 'API key or password')],
+        })
+
+    def test_analyze_logic_issues(self):
+        issues = asyncio.run(self.executor._analyze_logic_issues())
+        names = {path.name: found for path, found in issues.items()}
+        self.assertEqual(names, {'worker.py': [
+            ('poor_naming', 'Single-letter variables'),
+            ('race_condition', 'Threading without locks'),
+        ]})
+
+    def test_sources_are_read_once_until_changed(self):
+        async def analyze_all():
+            await self.executor._analyze_quality_issues()
+            await self.executor._analyze_security_issues()
+            await self.executor._analyze_logic_issues()
+
+        with patch.object(Path, 'read_text', autospec=True, side_effect=Path.read_text) as read:
+            asyncio.run(analyze_all())
+            self.assertEqual(read.call_count, 4)
+
+            (self.root / "src" / "config.py").write_text('API_KEY = None\n', encoding='utf-8')
+            issues = asyncio.run(self.executor._analyze_security_issues())
+            self.assertEqual(read.call_count, 5)
+        self.assertNotIn('config.py', {path.name for path in issues})
+
+    def test_analyze_all_matches_individual_analyzers(self):
+        results = asyncio.run(self.executor.analyze_all())
+
+        self.assertEqual(results['uncovered'], [])
+        self.assertEqual(results['quality'], asyncio.run(self.executor._analyze_quality_issues()))
+        self.assertEqual(results['security'], asyncio.run(self.executor._analyze_security_issues()))
+        self.assertEqual(results['logic'], asyncio.run(self.executor._analyze_logic_issues()))
+
+
+if __name__ == '__main__':
+    unittest.main()
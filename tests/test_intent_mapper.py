@@ -0,0 +1,32 @@
+
+import unittest
+import sys
+from pathlib import Path
+
+# Add project root to sys.path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from antigravity.core.local_reasoning import IntentMapper
+
+
+class TestIntentMapper(unittest.TestCase):
+    def setUp(self):
+        self.mapper = IntentMapper()
+
+    def test_requirements_and_framework(self):
+        intent = self.mapper.map("Build a FastAPI service with JWT login and pytest coverage")
+
+        self.assertTrue(intent.requires_api)
+        self.assertTrue(intent.requires_auth)
+        self.assertTrue(intent.requires_testing)
+        self.assertFalse(intent.requires_database)
+        self.assertEqual(intent.framework, 'fastapi')
+
+    def test_keywords_are_lowercased_and_stripped(self):
+        intent = self.mapper.map("Ship the Dashboard, real-time charts & user_profile pages!")
+
+        self.assertEqual(intent.keywords, ['ship', 'dashboard', 'realtime', 'charts', 'user_profile', 'pages'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+
+import unittest
+import sys
+from pathlib import Path
+
+# Add project root to sys.path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from antigravity.services.precision_healer import PrecisionHealer, IssueSeverity
+
+
+class TestPrecisionHealer(unittest.TestCase):
+    def setUp(self):
+        self.healer = PrecisionHealer()
+
+    def test_categorize_issue(self):
+        cases = {
+            "SyntaxError in main.py": ('syntax_error', IssueSeverity.CRITICAL, 25),
+            "Hardcoded API_KEY detected": ('hardcoded_secret', IssueSeverity.CRITICAL, 25),
+            "Use of eval()": ('unsafe_function', IssueSeverity.CRITICAL, 25),
+            "Cyclomatic complexity 14": ('high_complexity', IssueSeverity.WARNING, 10),
+            "Test coverage below 80%": ('low_coverage', IssueSeverity.WARNING, 10),
+            "No test for core module": ('missing_core_test', IssueSeverity.WARNING, 10),
+            "Missing docstring": ('missing_docstring', IssueSeverity.STYLE, 3),
+            "Bad variable naming": ('unused_variable', IssueSeverity.STYLE, 3),
+            "Odd name": ('poor_naming', IssueSeverity.STYLE, 3),
+            "Something else": ('unknown', IssueSeverity.STYLE, 3),
+        }
+        for issue, expected in cases.items():
+            with self.subTest(issue=issue):
+                self.assertEqual(self.healer._categorize_issue(issue), expected)
+
+    def test_tasks_sorted_by_roi(self):
+        tasks = self.healer.analyze_blocking_issues([
+            "Circular dependency between a and b",
+            "Missing docstring",
+            "Hardcoded password",
+        ])
+
+        self.assertEqual([t.issue_type for t in tasks],
+                         ['hardcoded_secret', 'circular_dependency', 'missing_docstring'])
+        self.assertEqual(tasks[0].healing_action, '🔒 迁移密钥到环境变量')
+        self.assertAlmostEqual(tasks[0].roi, 25 / 4)
+
+    def test_recommended_fixes_pick_highest_roi(self):
+        tasks = self.healer.analyze_blocking_issues([
+            "Missing docstring", "Race condition in worker", "Odd name", "SyntaxError",
+        ])
+
+        top = self.healer.get_recommended_fixes(list(reversed(tasks)), max_tasks=2)
+        self.assertEqual([t.issue_type for t in top], ['syntax_error', 'missing_docstring'])
+        self.assertEqual(self.healer.get_recommended_fixes(tasks, max_tasks=2), tasks[:2])
+
+
+if __name__ == '__main__':
+    unittest.main()
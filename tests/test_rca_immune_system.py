@@ -0,0 +1,165 @@
+import contextlib
+import io
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from antigravity.services import rca_immune_system
+from antigravity.services.rca_immune_system import RCAImmuneSystem
+
+
+class FakeClock:
+    """Manually advanced stand-in for time.monotonic"""
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+def capture(error):
+    """Raise and catch error so it carries a traceback"""
+    try:
+        raise error
+    except Exception as e:
+        return e
+
+
+class TestRCAImmuneSystem(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Nothing here writes to the project root (only the import-error fix
+        # appends to requirements.txt), so one directory serves every test
+        cls.temp_dir = tempfile.TemporaryDirectory()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.temp_dir.cleanup()
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.immune_system = RCAImmuneSystem(Path(self.temp_dir.name), clock=self.clock)
+        # The immune system narrates every step; keep it in one buffer per test
+        self.output = io.StringIO()
+        redirect = contextlib.redirect_stdout(self.output)
+        redirect.__enter__()
+        self.addCleanup(redirect.__exit__, None, None, None)
+
+    def test_immune_fatigue(self):
+        """A signature already MAX_HEALING_DEPTH deep escalates and locks the project"""
+        error = capture(KeyError('x'))
+        sig = self.immune_system._generate_error_signature(self.immune_system._extract_snapshot(error))
+        self.immune_system.healing_stack.extend([sig] * self.immune_system.MAX_HEALING_DEPTH)
+
+        result = self.immune_system.on_error_captured(error)
+
+        self.assertEqual(result.action, 'immune_fatigue_escalation')
+        self.assertIn('IMMUNE FATIGUE', self.output.getvalue())
+        self.assertEqual(len(self.immune_system.healing_stack), 0)
+        self.assertTrue(self.immune_system._is_in_cooldown('default'))
+
+    def test_rca_cooldown(self):
+        """Cooldowns expire on the injected clock, without sleeping"""
+        period = self.immune_system.COOLDOWN_PERIOD
+        self.immune_system._lock_project('project')
+        self.clock.advance(period - 1)
+        self.assertTrue(self.immune_system._is_in_cooldown('project'))
+        self.assertEqual(self.immune_system._get_cooldown_remaining('project'), 1.0)
+
+        self.clock.advance(1)
+        self.assertFalse(self.immune_system._is_in_cooldown('project'))
+        self.assertEqual(self.immune_system._get_cooldown_remaining('project'), 0.0)
+
+    def test_relock_supersedes_earlier_expiry(self):
+        """A re-lock outlives the expiry it replaced"""
+        period = self.immune_system.COOLDOWN_PERIOD
+        self.immune_system._lock_project('project')
+        self.clock.advance(period / 2)
+        self.immune_system._lock_project('project')
+
+        self.clock.advance(period / 2)
+        self.assertTrue(self.immune_system._is_in_cooldown('project'))
+        self.assertEqual(len(self.immune_system._cooldown_heap), 1)
+
+    def test_rca_fuzzy_signature(self):
+        """Signatures ignore the message, except for the missing module name"""
+        def snapshot(error):
+            return self.immune_system._extract_snapshot(capture(error))
+
+        sig = self.immune_system._generate_error_signature
+        first = sig(snapshot(ValueError('bad value 1')))
+        second = sig(snapshot(ValueError('bad value 2')))
+        self.assertEqual(first, second)
+        self.assertTrue(first.startswith('ValueError:'))
+
+        self.assertEqual(sig(snapshot(ModuleNotFoundError("No module named 'foo'"))),
+                         'ModuleNotFoundError:module=foo')
+        self.assertNotEqual(sig(snapshot(ModuleNotFoundError("No module named 'bar'"))),
+                            'ModuleNotFoundError:module=foo')
+
+    def test_healing_stack_unwinds(self):
+        """Each handled error leaves the healing stack as it found it"""
+        self.immune_system.healing_stack.append('outer')
+
+        self.immune_system.on_error_captured(capture(KeyError('x')))
+
+        self.assertEqual(list(self.immune_system.healing_stack), ['outer'])
+
+    def test_severity_table(self):
+        """Known error types map to their tier; anything else is MEDIUM"""
+        def severity(error):
+            return self.immune_system._analyze_severity(self.immune_system._extract_snapshot(capture(error)))
+
+        self.assertEqual(severity(ImportError('x')), 'LOW')
+        self.assertEqual(severity(KeyError('x')), 'MEDIUM')
+        self.assertEqual(severity(ValueError('x')), 'HIGH')
+        self.assertEqual(severity(OSError('x')), 'MEDIUM')
+
+    def test_repeated_traceback_is_formatted_once(self):
+        """A retry storm of the same error formats its traceback once"""
+        rca_immune_system._traceback_cache.clear()
+        format_exception = rca_immune_system.traceback.format_exception
+        with patch.object(rca_immune_system.traceback, 'format_exception', wraps=format_exception) as fmt:
+            snapshots = [self.immune_system._extract_snapshot(capture(KeyError('x'))) for _ in range(3)]
+            self.assertEqual(fmt.call_count, 1)
+            self.assertEqual(len({s.traceback for s in snapshots}), 1)
+
+            self.immune_system._extract_snapshot(capture(KeyError('y')))
+            self.assertEqual(fmt.call_count, 2)
+
+            # Chained errors carry extra text, so they are never served from the cache
+            try:
+                try:
+                    raise KeyError('x')
+                except KeyError:
+                    raise ValueError('wrapped')
+            except ValueError as e:
+                chained = e
+            self.immune_system._extract_snapshot(chained)
+            self.immune_system._extract_snapshot(chained)
+            self.assertEqual(fmt.call_count, 4)
+        self.assertEqual(snapshots[0].retry_count + 2, snapshots[2].retry_count)
+
+    def test_errors_with_hidden_details_are_not_cached(self):
+        """Same type, message and frames but different offset/text or sub-exceptions"""
+        rca_immune_system._traceback_cache.clear()
+        pairs = [(SyntaxError('bad', ('f.py', 1, 1, 'x = (\n')), SyntaxError('bad', ('f.py', 1, 5, 'y = ]\n')))]
+        if sys.version_info >= (3, 11):
+            pairs.append((ExceptionGroup('g', [KeyError('a')]), ExceptionGroup('g', [KeyError('b')])))
+        for first, second in pairs:
+            with self.subTest(error=type(first).__name__):
+                tracebacks = [self.immune_system._extract_snapshot(capture(e)).traceback for e in (first, second)]
+                self.assertNotEqual(tracebacks[0], tracebacks[1])
+        self.assertEqual(len(rca_immune_system._traceback_cache), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
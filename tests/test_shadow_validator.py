@@ -0,0 +1,64 @@
+
+import unittest
+import asyncio
+import tempfile
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+# Add project root to sys.path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from antigravity.services.shadow_validator import ShadowValidator
+
+
+class TestShadowValidator(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+        (self.root / "pkg").mkdir()
+        self.app = self.root / "pkg" / "app.py"
+        self.app.write_text("print('original')\n", encoding='utf-8')
+        self.validator = ShadowValidator(self.root)
+        # Keep the validator's progress output out of the test log
+        printer = patch('builtins.print')
+        printer.start()
+        self.addCleanup(printer.stop)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def run_heal(self, new_score):
+        async def heal(issue):
+            self.app.write_text("print('healed')\n", encoding='utf-8')
+            return {'success': True, 'message': 'ok', 'files_modified': [str(self.app)]}
+
+        with patch.object(ShadowValidator, '_silent_audit', return_value=new_score):
+            return asyncio.run(self.validator.shadow_heal_and_verify(heal, 'vibe', 'issue', 80.0))
+
+    def test_rollback_restores_from_memory(self):
+        result = self.run_heal(new_score=70.0)
+
+        self.assertEqual(result['status'], 'ROLLED_BACK')
+        self.assertEqual(self.app.read_text(encoding='utf-8'), "print('original')\n")
+        self.assertEqual(self.validator._memory_snapshots, {})
+        self.assertFalse((self.root / '.antigravity_snapshots').exists())
+
+    def test_success_keeps_changes_and_drops_snapshot(self):
+        result = self.run_heal(new_score=90.0)
+
+        self.assertEqual(result['status'], 'SUCCESS')
+        self.assertEqual(self.app.read_text(encoding='utf-8'), "print('healed')\n")
+        self.assertEqual(self.validator._memory_snapshots, {})
+
+    def test_deleted_file_is_restored(self):
+        snapshot_id = asyncio.run(self.validator._create_hot_snapshot())
+        self.app.unlink()
+        (self.root / "pkg").rmdir()
+
+        asyncio.run(self.validator._restore_hot_snapshot(snapshot_id))
+        self.assertEqual(self.app.read_text(encoding='utf-8'), "print('original')\n")
+
+
+if __name__ == '__main__':
+    unittest.main()
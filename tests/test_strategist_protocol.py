@@ -0,0 +1,50 @@
+
+import unittest
+import json
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+# Add project root to sys.path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from antigravity.services.strategist_protocol import StrategistProtocol
+
+BODY = json.dumps({
+    'logic_score': 88, 'approved': True, 'debt_found': ['global state'],
+    'naming_vibe': 'consistent', 'expert_advice': 'Wrap the ``` fence in a helper',
+})
+
+
+class TestParseResponse(unittest.TestCase):
+    def setUp(self):
+        self.protocol = StrategistProtocol()
+
+    def parse(self, text):
+        with patch('builtins.print'):
+            return self.protocol.parse_response(text, 'req-1')
+
+    def test_accepted_layouts(self):
+        layouts = {
+            'bare': BODY,
+            'json fence': f"Audit done.\n```json\n{BODY}\n```\nRegards",
+            'plain fence': f"```\n{BODY}\n```",
+            'trailing prose': f"{BODY}\n\nLet me know if you need more.",
+        }
+        for name, text in layouts.items():
+            with self.subTest(layout=name):
+                response = self.parse(text)
+                self.assertIsNotNone(response)
+                self.assertEqual(response.logic_score, 88)
+                self.assertEqual(response.expert_advice, 'Wrap the ``` fence in a helper')
+                self.assertEqual(response.request_id, 'req-1')
+
+    def test_rejected_responses(self):
+        incomplete = json.dumps({'logic_score': 50, 'approved': False})
+        for text in ("no json here", "```json\n{broken\n```", incomplete):
+            with self.subTest(text=text):
+                self.assertIsNone(self.parse(text))
+
+
+if __name__ == '__main__':
+    unittest.main()